@@ -0,0 +1,146 @@
+# File: analysis/cypher_examples.py
+# Description: Curated question→Cypher examples and a local-embedding index that picks the most relevant ones per question
+
+import hashlib
+import re
+from pathlib import Path
+import numpy as np
+
+CACHE_DIR = Path("data/cache")
+EMBED_MODEL = "nomic-embed-text"
+HASH_DIM = 512
+
+EXAMPLES = [
+    ("Show the addresses of the first 5 wallets",
+     "MATCH (w:Wallet)\nRETURN w.address\nLIMIT 5"),
+    ("What are the total number of transactions in the last 24 hours?",
+     "MATCH (t:Transaction)\nWHERE datetime(t.timestamp) > datetime() - duration('P1D')\nRETURN count(*) AS txn_count"),
+    ("Who received the highest transaction volume this week?",
+     "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)\nWHERE datetime(t.timestamp) > datetime() - duration('P7D')\n"
+     "WITH w, sum(t.volume_24h) AS total_volume\nRETURN w.address AS wallet, total_volume\nORDER BY total_volume DESC\nLIMIT 1"),
+    ("Which wallets sent transactions yesterday?",
+     "MATCH (w:Wallet)-[:SENT]->(t:Transaction)\n"
+     "WHERE date(datetime(t.timestamp)) = date() - duration('P1D')\nRETURN DISTINCT w.address AS wallet"),
+    ("Top 5 receivers this month",
+     "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)\nWHERE datetime(t.timestamp) > datetime() - duration('P1M')\n"
+     "WITH w, count(t) AS received_count\nRETURN w.address AS wallet, received_count\nORDER BY received_count DESC\nLIMIT 5"),
+    ("Top 5 senders of all time",
+     "MATCH (w:Wallet)-[:SENT]->(t:Transaction)\nWITH w, count(t) AS sent_count\n"
+     "RETURN w.address AS wallet, sent_count\nORDER BY sent_count DESC\nLIMIT 5"),
+    ("Which wallets did wallet_017 send funds to?",
+     "MATCH (w:Wallet {address: 'wallet_017'})-[:SENT]->(t:Transaction)-[:RECEIVED_BY]->(r:Wallet)\n"
+     "RETURN DISTINCT r.address AS receiver"),
+    ("How many transactions did wallet_042 receive in the last 24 hours?",
+     "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet {address: 'wallet_042'})\n"
+     "WHERE datetime(t.timestamp) > datetime() - duration('P1D')\nRETURN count(t) AS received_count"),
+    ("What was the average Bitcoin price today?",
+     "MATCH (t:Transaction)\nWHERE date(datetime(t.timestamp)) = date() AND t.price_usd IS NOT NULL\n"
+     "RETURN avg(t.price_usd) AS avg_price"),
+    ("What were the highest and lowest prices in the last 7 days?",
+     "CALL {\n  MATCH (t:Transaction)\n"
+     "  WHERE datetime(t.timestamp) > datetime() - duration('P7D') AND t.price_usd IS NOT NULL AND t.rolled_up IS NULL\n"
+     "  RETURN t.price_usd AS high, t.price_usd AS low\n  UNION ALL\n  MATCH (r:PriceRollup)\n"
+     "  WHERE datetime(r.bucket) > datetime() - duration('P7D')\n  RETURN r.high AS high, r.low AS low\n}\n"
+     "RETURN max(high) AS max_price, min(low) AS min_price"),
+    ("Show the daily average price for the last week",
+     "CALL {\n  MATCH (t:Transaction)\n"
+     "  WHERE datetime(t.timestamp) >= datetime() - duration('P7D') AND t.price_usd IS NOT NULL AND t.rolled_up IS NULL\n"
+     "  RETURN substring(t.timestamp, 0, 10) AS day, t.price_usd AS price, 1 AS ticks\n  UNION ALL\n"
+     "  MATCH (r:PriceRollup)\n  WHERE datetime(r.bucket) >= datetime() - duration('P7D')\n"
+     "  RETURN substring(r.bucket, 0, 10) AS day, r.avg_price AS price, r.tick_count AS ticks\n}\n"
+     "WITH day, sum(price * ticks) / sum(ticks) AS avg_price\nRETURN date(day) AS day, avg_price\nORDER BY day"),
+    ("What is the latest market cap and 24h volume?",
+     "MATCH (t:Transaction)\nWHERE t.market_cap IS NOT NULL\n"
+     "RETURN t.timestamp AS timestamp, t.market_cap AS market_cap, t.volume_24h AS volume_24h\n"
+     "ORDER BY t.timestamp DESC\nLIMIT 1"),
+    ("How many transactions happened per day this week?",
+     "MATCH (t:Transaction)\nWHERE datetime(t.timestamp) >= datetime() - duration('P7D')\n"
+     "RETURN date(datetime(t.timestamp)) AS day, count(*) AS txn_count\nORDER BY day"),
+    ("Which transactions had more than one receiver?",
+     "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)\nWITH t, count(w) AS receiver_count\n"
+     "WHERE receiver_count > 1\nRETURN t.tx_id AS tx_id, receiver_count"),
+    ("Which wallets have never received anything?",
+     "MATCH (w:Wallet)\nWHERE NOT EXISTS { (w)<-[:RECEIVED_BY]-(:Transaction) }\nRETURN w.address AS wallet"),
+    ("Which wallets both sent to and received from wallet_017?",
+     "MATCH (a:Wallet {address: 'wallet_017'})-[:SENT]->(:Transaction)-[:RECEIVED_BY]->(w:Wallet)\n"
+     "MATCH (w)-[:SENT]->(:Transaction)-[:RECEIVED_BY]->(a)\nRETURN DISTINCT w.address AS wallet"),
+    ("Who are the most central wallets by PageRank?",
+     "MATCH (w:Wallet)\nWHERE w.pagerank IS NOT NULL\n"
+     "RETURN w.address AS wallet, w.pagerank AS pagerank\nORDER BY pagerank DESC\nLIMIT 10"),
+    ("What was the total volume received per wallet yesterday?",
+     "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)\n"
+     "WHERE date(datetime(t.timestamp)) = date() - duration('P1D')\n"
+     "WITH w, sum(t.volume_24h) AS total_volume\nRETURN w.address AS wallet, total_volume\nORDER BY total_volume DESC"),
+]
+
+
+def library_hash(examples=EXAMPLES, model=EMBED_MODEL):
+    digest = hashlib.sha256(model.encode())
+    for question, cypher in examples:
+        digest.update(question.encode() + b"\0" + cypher.encode() + b"\0")
+    return digest.hexdigest()[:12]
+
+
+def hashing_embed(texts, dim=HASH_DIM):
+    """Dependency-free fallback: hashed bag of words and word bigrams."""
+    vectors = np.zeros((len(texts), dim))
+    for i, text in enumerate(texts):
+        tokens = re.findall(r"[a-z0-9_]+", text.lower())
+        for token in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            vectors[i, int(hashlib.md5(token.encode()).hexdigest(), 16) % dim] += 1.0
+    return vectors
+
+
+class ExampleIndex:
+    """Brute-force cosine index over example questions.
+
+    Uses Ollama embeddings when the model is available locally and falls back to
+    hashed bag-of-words vectors otherwise. Example embeddings are cached on disk
+    keyed by the library contents, so only the incoming question is embedded per request.
+    """
+
+    def __init__(self, examples=EXAMPLES, model=EMBED_MODEL):
+        self.examples = examples
+        self.model = model
+        self.embed = self._ollama_embed
+        try:
+            self.matrix = self._load_matrix()
+        except Exception as e:
+            self._fall_back(e)
+
+    def _fall_back(self, error):
+        print(f"⚠️ Embedding model '{self.model}' unavailable ({error}); using hashed bag-of-words similarity")
+        self.embed = hashing_embed
+        self.matrix = self._normalize(hashing_embed([q for q, _ in self.examples]))
+
+    def _ollama_embed(self, texts):
+        from langchain_ollama import OllamaEmbeddings
+        return np.array(OllamaEmbeddings(model=self.model).embed_documents(texts))
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _load_matrix(self):
+        cache_file = CACHE_DIR / f"cypher_examples_{library_hash(self.examples, self.model)}.npy"
+        if cache_file.exists():
+            return np.load(cache_file)
+        matrix = self._normalize(self.embed([q for q, _ in self.examples]))
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(cache_file, matrix)
+        return matrix
+
+    def select(self, question, k=3):
+        """Return the k examples most similar to the question, least similar first (closest sits next to the question)."""
+        try:
+            query = self._normalize(self.embed([question]))[0]
+        except Exception as e:
+            # The example matrix may come from the disk cache while Ollama itself is down
+            if self.embed is hashing_embed:
+                raise
+            self._fall_back(e)
+            query = self._normalize(self.embed([question]))[0]
+        scores = self.matrix @ query
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [self.examples[i] for i in top[::-1]]
@@ -0,0 +1,225 @@
+# File: analysis/fund_flow.py
+# Description: Traces multi-hop fund flows between wallets with bidirectional BFS over an in-memory adjacency snapshot
+
+import argparse
+import time
+from bisect import bisect_left, bisect_right
+import numpy as np
+from analysis.graph_analytics import graph_version, load_edges
+
+_snapshot = None
+
+# Sorts after every ISO timestamp: "no time limit" in latest_departures()
+NO_LIMIT = "\uffff"
+
+
+class FlowSnapshot:
+    """Compact wallet->wallet adjacency built from the exported edge arrays.
+
+    Transfers between the same pair of wallets are grouped into a "pair" whose
+    edges are sorted by timestamp, so causal lookups are a single bisect.
+    """
+
+    def __init__(self, edges, version):
+        self.version = version
+        self.addresses = edges["addresses"].tolist()
+        self.index = {address: i for i, address in enumerate(self.addresses)}
+        n = len(self.addresses)
+
+        order = np.lexsort((edges["timestamp"], edges["dst"], edges["src"]))
+        src = edges["src"][order]
+        dst = edges["dst"][order]
+
+        if len(src):
+            boundary = np.r_[True, (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])]
+            pair_start = np.flatnonzero(boundary)
+        else:
+            pair_start = np.zeros(0, dtype=np.int64)
+        pair_src = src[pair_start]
+        pair_dst = dst[pair_start]
+        in_order = np.argsort(pair_dst, kind="stable")
+
+        self.edge_ts = edges["timestamp"][order].tolist()
+        self.edge_tx = edges["tx_id"][order].tolist()
+        self.pair_start = pair_start.tolist()
+        self.pair_end = np.r_[pair_start[1:], len(src)].astype(np.int64).tolist()
+        self.pair_src = pair_src.tolist()
+        self.pair_dst = pair_dst.tolist()
+        self.out_indptr = np.searchsorted(pair_src, np.arange(n + 1)).tolist()
+        self.in_pairs = in_order.tolist()
+        self.in_indptr = np.searchsorted(pair_dst[in_order], np.arange(n + 1)).tolist()
+
+    def successors(self, u):
+        for p in range(self.out_indptr[u], self.out_indptr[u + 1]):
+            yield self.pair_dst[p], p
+
+    def predecessors(self, v):
+        for j in range(self.in_indptr[v], self.in_indptr[v + 1]):
+            p = self.in_pairs[j]
+            yield self.pair_src[p], p
+
+    def shortest_hops(self, source, target, max_hops):
+        """Bidirectional BFS; returns the minimum hop count or None if beyond max_hops."""
+        if source == target:
+            return 0
+        seen_fwd, seen_bwd = {source}, {target}
+        frontier_fwd, frontier_bwd = [source], [target]
+        depth = 0
+
+        while frontier_fwd and frontier_bwd and depth < max_hops:
+            depth += 1
+            forward = len(frontier_fwd) <= len(frontier_bwd)
+            frontier = frontier_fwd if forward else frontier_bwd
+            seen, other = (seen_fwd, seen_bwd) if forward else (seen_bwd, seen_fwd)
+            step = self.successors if forward else self.predecessors
+
+            next_frontier = []
+            for u in frontier:
+                for v, _ in step(u):
+                    if v in other:
+                        return depth
+                    if v not in seen:
+                        seen.add(v)
+                        next_frontier.append(v)
+
+            if forward:
+                frontier_fwd = next_frontier
+            else:
+                frontier_bwd = next_frontier
+        return None
+
+    def latest_departures(self, target, max_hops, causal):
+        """
+        Reverse DP over exact hop counts: latest[r][v] is the latest "after" time from which v
+        can still reach target in exactly r (time-ordered, if causal) hops; absent means never.
+
+        It ignores the simple-path rule, so it never prunes a real path, but it lets _extend
+        skip every branch that cannot finish instead of enumerating it (O(max_hops * E log E)).
+        """
+        latest = [{target: NO_LIMIT}]
+        for r in range(1, max_hops + 1):
+            reachable = {}
+            for v, limit in latest[-1].items():
+                if v == target and r > 1:
+                    continue  # paths may only touch the target at the end
+                for u, pair in self.predecessors(v):
+                    if causal:
+                        # Latest transfer on this pair that still leaves v in time
+                        i = bisect_right(self.edge_ts, limit, self.pair_start[pair], self.pair_end[pair]) - 1
+                        if i < self.pair_start[pair]:
+                            continue
+                        departure = self.edge_ts[i]
+                    else:
+                        departure = NO_LIMIT
+                    if u not in reachable or departure > reachable[u]:
+                        reachable[u] = departure
+            latest.append(reachable)
+        return latest
+
+    def _pick_edge(self, pair, after, causal):
+        start, end = self.pair_start[pair], self.pair_end[pair]
+        if not causal:
+            return start
+        i = bisect_left(self.edge_ts, after, start, end)
+        return i if i < end else None
+
+    def _extend(self, u, target, remaining, after, causal, latest, on_path, hops, found, k):
+        if remaining == 0:
+            if u == target:
+                found.append(list(hops))
+            return len(found) >= k
+
+        for v, pair in self.successors(u):
+            limit = latest[remaining - 1].get(v)
+            if v in on_path or limit is None:
+                continue
+            if v == target and remaining > 1:
+                continue
+            # The earliest usable transfer leaves the most room; it must still arrive before v's limit
+            edge = self._pick_edge(pair, after, causal)
+            if edge is None or self.edge_ts[edge] > limit:
+                continue
+
+            on_path.add(v)
+            hops.append((u, v, edge))
+            done = self._extend(v, target, remaining - 1, self.edge_ts[edge], causal, latest, on_path, hops, found, k)
+            hops.pop()
+            on_path.discard(v)
+            if done:
+                return True
+        return False
+
+    def trace(self, source, target, max_hops=4, k=5, causal=False):
+        """Return up to k simple paths from source to target, shortest first."""
+        if source not in self.index or target not in self.index or source == target:
+            return []
+        s, t = self.index[source], self.index[target]
+
+        shortest = self.shortest_hops(s, t, max_hops)
+        if shortest is None:
+            return []
+
+        latest = self.latest_departures(t, max_hops, causal)
+        found = []
+        for length in range(shortest, max_hops + 1):
+            if s not in latest[length]:
+                continue
+            if self._extend(s, t, length, "", causal, latest, {s}, [], found, k):
+                break
+        return [self._describe(path) for path in found]
+
+    def _describe(self, path):
+        wallets = [self.addresses[path[0][0]]] + [self.addresses[v] for _, v, _ in path]
+        transfers = [
+            {
+                "from": self.addresses[u],
+                "to": self.addresses[v],
+                "tx_id": self.edge_tx[edge],
+                "timestamp": self.edge_ts[edge],
+            }
+            for u, v, edge in path
+        ]
+        return {"hops": len(path), "wallets": wallets, "transfers": transfers}
+
+
+def get_snapshot():
+    """Return the adjacency snapshot, rebuilding it only when the graph version changes."""
+    global _snapshot
+    version = graph_version()
+    if _snapshot is None or _snapshot.version != version:
+        _, edges = load_edges(version)
+        _snapshot = FlowSnapshot(edges, version)
+    return _snapshot
+
+
+def trace_fund_flow(source, target, max_hops=4, k=5, causal=False):
+    """Trace up to k shortest fund-flow paths; returns (paths, elapsed_ms) for the search itself."""
+    snapshot = get_snapshot()
+    start = time.perf_counter()
+    paths = snapshot.trace(source, target, max_hops=max_hops, k=k, causal=causal)
+    return paths, (time.perf_counter() - start) * 1000
+
+
+def path_edges(paths):
+    """Wallet->transaction->wallet edges for the given paths, as drawn in the wallet graph."""
+    edges = []
+    for path in paths:
+        for hop in path["transfers"]:
+            edges.append((hop["from"], hop["tx_id"]))
+            edges.append((hop["tx_id"], hop["to"]))
+    return edges
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trace fund flows between two wallets")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--max-hops", type=int, default=4)
+    parser.add_argument("-k", type=int, default=5, help="Number of shortest paths to return")
+    parser.add_argument("--causal", action="store_true", help="Only follow time-ordered transfers")
+    args = parser.parse_args()
+
+    paths, elapsed_ms = trace_fund_flow(args.source, args.target, args.max_hops, args.k, args.causal)
+    print(f"🔎 {len(paths)} path(s) found in {elapsed_ms:.2f} ms")
+    for path in paths:
+        print(f"  [{path['hops']} hops] " + " -> ".join(path["wallets"]))
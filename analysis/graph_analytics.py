@@ -0,0 +1,196 @@
+# File: analysis/graph_analytics.py
+# Description: Bulk-exports the wallet graph into a sparse CSR adjacency and computes PageRank, degree and weakly-connected components
+
+import os
+import hashlib
+import zipfile
+import argparse
+from pathlib import Path
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+from utils.data_version import bump_data_version, get_data_versions
+from utils.queries import run_query, stream_query
+from utils.atomic import atomic_path
+
+# Load environment variables
+load_dotenv()
+URI = os.getenv("NEO4J_URI")
+USER = os.getenv("NEO4J_USER")
+PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+# Paths
+CACHE_DIR = Path("data/cache")
+
+# Tuning
+FETCH_SIZE = 5000
+WRITE_BATCH_SIZE = 1000
+DAMPING = 0.85
+
+# Connect to Neo4j
+driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
+
+
+def graph_version():
+    """Return a short fingerprint of the wallet graph that changes whenever edges are added."""
+    with driver.session() as session:
+        # The wallets watermark is bumped on every simulate_wallets commit; fall back to counts on older graphs
+        watermark = get_data_versions(session, ["wallets"])["wallets"]
+        if watermark:
+            return f"w{watermark}"
+        record = run_query(session, "wallet_graph_counts")[0]
+    key = f"{record['wallet_count']}:{record['sent_count']}:{record['received_count']}"
+    return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+
+def export_edges():
+    """Stream wallet->wallet transfers out of Neo4j into compact NumPy arrays."""
+    index = {}
+    src, dst, tx_ids, timestamps = [], [], [], []
+
+    with driver.session(fetch_size=FETCH_SIZE) as session:
+        for record in stream_query(session, "wallet_transfers"):
+            src.append(index.setdefault(record["sender"], len(index)))
+            dst.append(index.setdefault(record["receiver"], len(index)))
+            tx_ids.append(record["tx_id"] or "")
+            timestamps.append(str(record["ts"] or ""))
+
+    return {
+        "addresses": np.array(list(index), dtype=str),
+        "src": np.array(src, dtype=np.int32),
+        "dst": np.array(dst, dtype=np.int32),
+        "tx_id": np.array(tx_ids, dtype=str),
+        "timestamp": np.array(timestamps, dtype=str),
+    }
+
+
+def load_edges(version=None, use_cache=True):
+    """Return the edge arrays for the given graph version, exporting and caching them on a miss."""
+    version = version or graph_version()
+    cache_file = CACHE_DIR / f"wallet_edges_{version}.npz"
+
+    if use_cache and cache_file.exists():
+        try:
+            with np.load(cache_file) as cached:
+                return version, {k: cached[k] for k in cached.files}
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f"⚠️ Ignoring unreadable edge cache {cache_file.name}: {e}")
+
+    edges = export_edges()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Temp file + rename: an interrupted or concurrent run never leaves a truncated snapshot behind
+    with atomic_path(cache_file) as tmp:
+        np.savez_compressed(tmp, **edges)
+    for stale in CACHE_DIR.glob("wallet_edges_*.npz"):
+        if stale != cache_file:
+            stale.unlink(missing_ok=True)
+    return version, edges
+
+
+def build_adjacency(edges):
+    """Build a weighted wallet->wallet CSR matrix; weights are the number of transfers."""
+    n = len(edges["addresses"])
+    weights = np.ones(len(edges["src"]), dtype=np.float64)
+    adjacency = sp.csr_matrix((weights, (edges["src"], edges["dst"])), shape=(n, n))
+    adjacency.sum_duplicates()
+    return adjacency
+
+
+def pagerank(adjacency, damping=DAMPING, tol=1e-10, max_iter=100):
+    """Vectorized power-iteration PageRank over a weighted CSR adjacency."""
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transition = sp.diags(inv_out) @ adjacency
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        dangling_mass = rank[dangling].sum()
+        updated = damping * (transition.T @ rank + dangling_mass / n) + (1.0 - damping) / n
+        if np.abs(updated - rank).sum() < tol:
+            return updated
+        rank = updated
+    return rank
+
+
+def degrees(adjacency):
+    """Distinct counterparties per wallet as (in_degree, out_degree)."""
+    binary = adjacency.copy()
+    binary.data = np.ones_like(binary.data)
+    in_degree = np.asarray(binary.sum(axis=0)).ravel().astype(np.int64)
+    out_degree = np.asarray(binary.sum(axis=1)).ravel().astype(np.int64)
+    return in_degree, out_degree
+
+
+def weak_components(adjacency):
+    """Weakly-connected component label and component size per wallet."""
+    _, labels = connected_components(adjacency, directed=True, connection="weak")
+    sizes = np.bincount(labels)
+    return labels, sizes[labels]
+
+
+def write_scores(tx, rows, version):
+    run_query(tx, "write_wallet_scores", rows=rows, version=version)
+    bump_data_version(tx, "analytics")
+
+
+def clear_stale_scores(tx, version):
+    """Remove scores from wallets that were not part of this run's graph (e.g. no longer in any edge)."""
+    cleared = run_query(tx, "clear_stale_wallet_scores", version=version)[0]["cleared"]
+    if cleared:
+        bump_data_version(tx, "analytics")
+    return cleared
+
+
+def run_graph_analytics(use_cache=True):
+    """Export the graph, compute all scores and write them back as Wallet properties."""
+    version, edges = load_edges(use_cache=use_cache)
+    adjacency = build_adjacency(edges)
+
+    ranks = pagerank(adjacency)
+    in_degree, out_degree = degrees(adjacency)
+    labels, sizes = weak_components(adjacency)
+
+    rows = [
+        {
+            "address": address,
+            "pagerank": float(ranks[i]),
+            "in_degree": int(in_degree[i]),
+            "out_degree": int(out_degree[i]),
+            "component": int(labels[i]),
+            "component_size": int(sizes[i]),
+        }
+        for i, address in enumerate(edges["addresses"].tolist())
+    ]
+
+    with driver.session() as session:
+        for start in range(0, len(rows), WRITE_BATCH_SIZE):
+            session.execute_write(write_scores, rows[start:start + WRITE_BATCH_SIZE], version)
+        cleared = session.execute_write(clear_stale_scores, version)
+
+    return {
+        "version": version,
+        "wallets": adjacency.shape[0],
+        "cleared": cleared,
+        "edges": adjacency.nnz,
+        "components": int(labels.max()) + 1 if len(labels) else 0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute wallet graph analytics and write scores to Neo4j")
+    parser.add_argument("--no-cache", action="store_true", help="Re-export edges even if a cached snapshot exists")
+    args = parser.parse_args()
+
+    print("📡 Exporting wallet graph from Neo4j...")
+    summary = run_graph_analytics(use_cache=not args.no_cache)
+    print(f"✅ Scored {summary['wallets']} wallets over {summary['edges']} edges "
+          f"({summary['components']} components, graph version {summary['version']}); "
+          f"cleared stale scores on {summary['cleared']} wallet(s)")
+    driver.close()
@@ -5,6 +5,8 @@ import os
 from pyvis.network import Network
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
+from utils.atomic import atomic_path
+from utils.queries import run_query
 
 # Load environment variables
 load_dotenv()
@@ -15,32 +17,36 @@ PASSWORD = os.getenv("NEO4J_PASSWORD")
 # Connect to Neo4j
 driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
 
+def read_graph_edges(session, limit=200):
+    # LIMIT is a parameter, so every limit shares one cached plan
+    result = run_query(session, "recent_graph_edges", limit=limit)
+    return [(record["from"], record["to"]) for record in result]
+
+
 def fetch_graph_data(limit=200):
-    query = f'''
-    CALL {{
-        MATCH (w:Wallet)-[:SENT]->(t:Transaction)
-        RETURN w.address AS from, t.tx_id AS to, t.timestamp AS ts
-        UNION
-        MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)
-        RETURN t.tx_id AS from, w.address AS to, t.timestamp AS ts
-    }}
-    RETURN from, to
-    ORDER BY ts DESC
-    LIMIT {limit}
-    '''
     with driver.session() as session:
-        result = session.run(query)
-        return [(record["from"], record["to"]) for record in result]
+        return read_graph_edges(session, limit)
 
 
-def create_pyvis_graph(edges, output_file="wallet_graph.html"):
+def create_pyvis_graph(edges, output_file="wallet_graph.html", highlight=None):
     net = Network(height="800px", width="100%", directed=True)
     net.barnes_hut()
 
+    # Highlighted edges (e.g. traced fund-flow paths) are drawn on top of the regular graph
+    highlight = set(highlight or [])
+    highlight_nodes = {node for edge in highlight for node in edge}
+    edges = list(dict.fromkeys(list(edges) + list(highlight)))
+
     for from_node, to_node in edges:
-        net.add_node(from_node, label=from_node, color="skyblue" if "wallet_" in from_node else "orange")
-        net.add_node(to_node, label=to_node, color="skyblue" if "wallet_" in to_node else "orange")
-        net.add_edge(from_node, to_node)
+        for node in (from_node, to_node):
+            color = "skyblue" if "wallet_" in node else "orange"
+            if node in highlight_nodes:
+                color = "crimson"
+            net.add_node(node, label=node, color=color)
+        if (from_node, to_node) in highlight:
+            net.add_edge(from_node, to_node, color="crimson", width=4)
+        else:
+            net.add_edge(from_node, to_node)
 
     net.set_options('''
     var options = {
@@ -67,7 +73,8 @@ def create_pyvis_graph(edges, output_file="wallet_graph.html"):
       }
     }
     ''')
-    net.show(output_file)
+    with atomic_path(output_file) as tmp:
+        net.show(str(tmp))
     print(f"✅ Graph exported to: {output_file}")
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+# File: analysis/indicators.py
+# Description: Vectorized NumPy technical indicators (SMA, EMA, VWAP, Bollinger, RSI, realized volatility) with incremental append
+
+import json
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from utils.atomic import write_text_atomic
+
+SMA_WINDOWS = (5, 20, 50)
+EMA_SPANS = (12, 26)
+BOLLINGER_WINDOW = 20
+BOLLINGER_K = 2.0
+RSI_PERIOD = 14
+VOL_WINDOW = 20
+
+
+def sma(x, window):
+    """Simple moving average; NaN until `window` points are available."""
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        csum = np.cumsum(np.insert(x, 0, 0.0))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def rolling_std(x, window, ddof=0):
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window).std(axis=1, ddof=ddof)
+    return out
+
+
+def ema(x, alpha, initial=None):
+    """Exponential moving average y[t] = alpha*x[t] + (1-alpha)*y[t-1], seeded with `initial` or x[0]."""
+    x = np.asarray(x, dtype=float)
+    if len(x) == 0:
+        return x
+    seed = x[0] if initial is None else initial
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * seed])
+    return y
+
+
+def bollinger(x, window=BOLLINGER_WINDOW, k=BOLLINGER_K):
+    """(middle, upper, lower) bands: SMA ± k population standard deviations."""
+    mid = sma(x, window)
+    width = k * rolling_std(x, window)
+    return mid, mid + width, mid - width
+
+
+def realized_volatility(x, window=VOL_WINDOW):
+    """Rolling standard deviation of log returns over `window` returns, in percent per step."""
+    x = np.asarray(x, dtype=float)
+    returns = np.diff(np.log(x), prepend=np.nan)
+    out = np.full(len(x), np.nan)
+    if len(x) > window:
+        out[window:] = sliding_window_view(returns[1:], window).std(axis=1, ddof=1) * 100
+    return out
+
+
+def wilder_rsi(x, period=RSI_PERIOD, prev=None, avg_gain=None, avg_loss=None, seen=0):
+    """
+    RSI with Wilder smoothing (an EMA with alpha = 1/period over gains and losses).
+
+    Pass the state returned by a previous call to continue a series; returns (rsi, state).
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) == 0:
+        return x, {"prev": prev, "avg_gain": avg_gain, "avg_loss": avg_loss, "seen": seen}
+
+    changes = np.diff(x, prepend=x[0] if prev is None else prev)
+    if prev is None:
+        changes = changes[1:]
+    gains, losses = np.clip(changes, 0, None), np.clip(-changes, 0, None)
+
+    alpha = 1.0 / period
+    g = ema(gains, alpha, avg_gain)
+    l = ema(losses, alpha, avg_loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(l == 0, 100.0, 100.0 - 100.0 / (1.0 + g / l))
+
+    # Changes needed before RSI is reported
+    counts = seen + np.arange(1, len(changes) + 1)
+    rsi = np.where(counts >= period, rsi, np.nan)
+    if prev is None:
+        rsi = np.insert(rsi, 0, np.nan)
+
+    state = {
+        "prev": float(x[-1]),
+        "avg_gain": float(g[-1]) if len(g) else avg_gain,
+        "avg_loss": float(l[-1]) if len(l) else avg_loss,
+        "seen": int(seen + len(changes)),
+    }
+    return rsi, state
+
+
+def session_vwap(price, volume, days, state=None):
+    """
+    VWAP anchored at the start of each calendar day; returns (vwap, state).
+
+    Weights are the 24h volume reported with each tick, as the feed carries no per-trade volume.
+    """
+    price = np.asarray(price, dtype=float)
+    volume = np.nan_to_num(np.asarray(volume, dtype=float))
+    days = np.asarray(days)
+    state = state or {"day": None, "pv": 0.0, "v": 0.0}
+    if len(price) == 0:
+        return price, state
+
+    pv = price * volume
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(price)]))
+    cum_pv = np.cumsum(pv)
+    cum_v = np.cumsum(volume)
+    # Restart the running sums at every day boundary
+    cum_pv -= np.r_[0.0, cum_pv][starts][seg]
+    cum_v -= np.r_[0.0, cum_v][starts][seg]
+
+    # The first segment continues the saved session if it is still the same day
+    if days[0] == state["day"]:
+        first = seg == 0
+        cum_pv[first] += state["pv"]
+        cum_v[first] += state["v"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(cum_v > 0, cum_pv / cum_v, price)
+    return vwap, {"day": str(days[-1]), "pv": float(cum_pv[-1]), "v": float(cum_v[-1])}
+
+
+class IndicatorSet:
+    """
+    All dashboard indicators over one price/volume series, extendable in place.
+
+    `append()` only computes the new points: windowed indicators run over the
+    retained tail plus the new values, recursive ones (EMA, RSI, VWAP) resume from
+    their saved state. The result matches a full recomputation of the same series.
+    """
+
+    TAIL = max(max(SMA_WINDOWS), BOLLINGER_WINDOW, VOL_WINDOW + 1)
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.tail = state.get("tail", [])
+        self.last_timestamp = state.get("last_timestamp")
+        self.ema_last = state.get("ema_last", {})
+        self.rsi_state = state.get("rsi_state", {})
+        self.vwap_state = state.get("vwap_state")
+
+    @staticmethod
+    def columns():
+        return ([f"sma_{w}" for w in SMA_WINDOWS] + [f"ema_{s}" for s in EMA_SPANS] +
+                ["vwap", "bb_mid", "bb_upper", "bb_lower", f"rsi_{RSI_PERIOD}", f"vol_{VOL_WINDOW}"])
+
+    def append(self, timestamps, price, volume):
+        """Extend the series with new points and return {column: values} for those points only."""
+        price = np.asarray(price, dtype=float)
+        m = len(price)
+        if m == 0:
+            return {c: np.empty(0) for c in self.columns()}
+
+        window = np.concatenate([np.asarray(self.tail, dtype=float), price])
+        out = {}
+        for w in SMA_WINDOWS:
+            out[f"sma_{w}"] = sma(window, w)[-m:]
+        for span in EMA_SPANS:
+            values = ema(price, 2.0 / (span + 1), self.ema_last.get(str(span)))
+            self.ema_last[str(span)] = float(values[-1])
+            out[f"ema_{span}"] = values
+
+        days = np.array([str(ts)[:10] for ts in timestamps])
+        out["vwap"], self.vwap_state = session_vwap(price, volume, days, self.vwap_state)
+
+        mid, upper, lower = bollinger(window)
+        out["bb_mid"], out["bb_upper"], out["bb_lower"] = mid[-m:], upper[-m:], lower[-m:]
+        out[f"rsi_{RSI_PERIOD}"], self.rsi_state = wilder_rsi(price, RSI_PERIOD, **self.rsi_state)
+        out[f"vol_{VOL_WINDOW}"] = realized_volatility(window)[-m:]
+
+        self.tail = window[-self.TAIL:].tolist()
+        self.last_timestamp = str(timestamps[-1])
+        return out
+
+    def to_dict(self):
+        return {
+            "tail": self.tail, "last_timestamp": self.last_timestamp, "ema_last": self.ema_last,
+            "rsi_state": self.rsi_state, "vwap_state": self.vwap_state,
+        }
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(path, json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path):
+        try:
+            return cls(json.loads(path.read_text()))
+        except (OSError, json.JSONDecodeError):
+            return None
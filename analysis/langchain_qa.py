@@ -4,8 +4,8 @@
 import os
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from langchain_core.prompts import PromptTemplate
 from langchain_ollama import ChatOllama
+from analysis.cypher_examples import ExampleIndex
 
 # Load environment variables
 load_dotenv()
@@ -17,8 +17,9 @@ driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
 # Choose model source here
 llm = ChatOllama(model="mistral", temperature=0.0)
 
-# Cypher generation prompt
-TEMPLATE = """
+# Cypher generation prompt. PREFIX must stay byte-identical across requests so the model
+# server can reuse its prompt cache; only the selected examples and the question vary.
+PREFIX = """
 You are an expert Cypher developer assisting a user in querying a property graph database using natural language. 
 Use the following schema to generate accurate and executable Cypher queries.
 
@@ -32,6 +33,17 @@ Transaction node properties:
 - market_cap (float)
 - volume_24h (float)
 
+Wallet node properties:
+- address (string, e.g. 'wallet_017')
+- pagerank, in_degree, out_degree, component (set by graph analytics; may be missing)
+
+PriceRollup node properties (older prices; not connected to other nodes):
+- tier ('hourly' or 'daily')
+- bucket (ISO string, start of the hour or day)
+- open, high, low, close, avg_price (float)
+- volume (float, average 24h volume over the bucket)
+- tick_count (int, number of raw ticks summarized)
+
 Guidelines:
 - Use clear, consistent variable names like `wallet`, `txn`, `volume`, `received_count`, etc.
 - Use multiple WITH clauses for complex logic or intermediate aggregations.
@@ -41,40 +53,29 @@ Guidelines:
 - Do not include comments, explanations, or extra spacing — only the final Cypher query.
 - Your output must be syntactically correct and ready to execute in Neo4j without modification.
 - If the question is ambiguous, make a useful, reasonable assumption and generate the best-fit query.
+- Raw Transaction prices are only kept for the last 48 hours; older ticks are compacted into PriceRollup buckets (ticks with wallet links stay, flagged rolled_up = true).
+  For prices spanning more than 2 days, combine Transaction nodes with `rolled_up IS NULL` and PriceRollup nodes using CALL { ... UNION ALL ... }.
 - If the user refers to an earlier question (e.g., “same as before”), handle context appropriately for follow-ups.
 
 Examples:
 
-Q: Show the addresses of the first 5 wallets  
-A:  
-MATCH (w:Wallet)  
-RETURN w.address  
-LIMIT 5
-
-Q: What are the total number of transactions in the last 24 hours?  
-A:  
-MATCH (t:Transaction)  
-WHERE datetime(t.timestamp) > datetime() - duration('P1D')  
-RETURN count(*) AS txn_count
-
-Q: Who received the highest transaction volume this week?  
-A:  
-MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)  
-WHERE datetime(t.timestamp) > datetime() - duration('P7D')  
-WITH w, sum(t.volume_24h) AS total_volume  
-RETURN w.address AS wallet, total_volume  
-ORDER BY total_volume DESC  
-LIMIT 1
-
-Q: {question}
-
-A:
 """
 
-prompt = PromptTemplate(input_variables=["question"], template=TEMPLATE)
+EXAMPLE_COUNT = 3
+_example_index = None
+
+
+def build_prompt(question: str, k: int = EXAMPLE_COUNT):
+    """Static prefix + the k most similar curated examples + the question."""
+    global _example_index
+    if _example_index is None:
+        _example_index = ExampleIndex()
+    examples = "".join(f"Q: {q}\nA:\n{cypher}\n\n" for q, cypher in _example_index.select(question, k))
+    return f"{PREFIX}{examples}Q: {question}\n\nA:\n"
+
 
 def run_qa_question(question: str):
-    formatted_prompt = prompt.format(question=question)
+    formatted_prompt = build_prompt(question)
     cypher = llm.invoke(formatted_prompt).content.strip()
 
     print("\nQuestion:", question)
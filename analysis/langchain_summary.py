@@ -1,11 +1,14 @@
 # File: analysis/langchain_summary.py
-# Description: Generates a natural language summary of recent Bitcoin prices and wallet activity using a local LLM (Mistral via Ollama)
+# Description: Summarizes recent Bitcoin prices and wallet activity from deterministic statistics, optionally paraphrased by a local LLM (Mistral via Ollama)
 
 import os
+import argparse
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from langchain_ollama import ChatOllama
-from langchain.prompts import ChatPromptTemplate
+from utils.rollup import fetch_daily_prices
+from analysis.stats_engine import compute_facts, render_summary
+from utils.atomic import write_text_atomic
+from utils.queries import run_query
 
 # Load environment variables
 load_dotenv()
@@ -16,80 +19,59 @@ driver = GraphDatabase.driver(
     auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
 )
 
-# Use Mistral model running locally via Ollama
-llm = ChatOllama(model="mistral")
+# Wallets considered for concentration metrics (the summary still names only the top 3)
+WALLET_SAMPLE = 1000
 
 def fetch_prices():
     """Fetch daily average, max, and min Bitcoin price for the last 7 days."""
     with driver.session() as session:
-        result = session.run(
-            """
-            MATCH (t:Transaction)
-            WHERE datetime(t.timestamp) >= datetime() - duration('P7D')
-            WITH date(datetime(t.timestamp)) AS day, 
-                 avg(t.price_usd) AS avg_price,
-                 max(t.price_usd) AS max_price, 
-                 min(t.price_usd) AS min_price
-            RETURN day, avg_price, max_price, min_price
-            ORDER BY day
-            """
-        )
-        return list(result)
+        return fetch_daily_prices(session, days=7)
+
+
+def read_top_wallets(session, n=3):
+    return run_query(session, "top_receiving_wallets", n=n)
 
 
 def get_top_wallets(n=3):
     """Query Neo4j for top n most active receiving wallets."""
     with driver.session() as session:
-        result = session.run(
-            """
-            MATCH (w:Wallet)<-[:RECEIVED_BY]-(:Transaction)
-            RETURN w.address AS address, count(*) AS received_count
-            ORDER BY received_count DESC
-            LIMIT $n
-            """, {"n": n}
-        )
-        return list(result)
-
-
-def summarize_data(price_data, wallet_data):
-    price_series = [
-        f"{record['day']}: avg=${record['avg_price']:.2f}, max=${record['max_price']:.2f}, min=${record['min_price']:.2f}"
-        for record in price_data
-    ]
-
-    wallet_lines = [f"{w['address']}: {w['received_count']} txns received" for w in wallet_data]
-    wallet_info = "\n".join(wallet_lines)
+        return read_top_wallets(session, n)
 
-    prompt = ChatPromptTemplate.from_template("""
-    You are a data analyst. Here is Bitcoin time series price data:
 
-    {price_data}
+def paraphrase(summary):
+    """Rewrite the fact-based summary as prose with Mistral via Ollama, keeping every number."""
+    from langchain_ollama import ChatOllama
+    from langchain.prompts import ChatPromptTemplate
 
-    And here is wallet activity:
-
-    {wallet_data}
+    prompt = ChatPromptTemplate.from_template("""
+    You are a data analyst. Rewrite the following Bitcoin market facts as a short, clear summary.
+    Keep every number exactly as given and do not add facts that are not listed.
 
-    Provide a short, clear summary covering price trends and wallet activity.
+    {facts}
     """)
-
-    formatted = prompt.format_messages(
-        price_data="\n".join(price_series),
-        wallet_data=wallet_info
-    )
-    response = llm.invoke(formatted)
+    response = ChatOllama(model="mistral").invoke(prompt.format_messages(facts=summary))
     return response.content
 
 
+def summarize_data(price_data, wallet_data, use_llm=False):
+    """Compute statistics and render them as text; the LLM is only used to paraphrase when asked."""
+    summary = render_summary(compute_facts(price_data, wallet_data))
+    return paraphrase(summary) if use_llm else summary
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize recent Bitcoin prices and wallet activity")
+    parser.add_argument("--llm", action="store_true", help="Paraphrase the computed summary with the local LLM")
+    args = parser.parse_args()
+
     print("📡 Fetching Bitcoin data from Neo4j...")
     price_data = fetch_prices()
-    wallet_data = get_top_wallets()
+    wallet_data = get_top_wallets(WALLET_SAMPLE)
 
-    print("🧠 Generating combined summary...\n")
-    summary = summarize_data(price_data, wallet_data)
+    print("🧮 Computing summary statistics...\n")
+    summary = summarize_data(price_data, wallet_data, use_llm=args.llm)
 
-    print("🔍 NLP Summary:\n")
+    print("🔍 Summary:\n")
     print(summary)
 
-    with open("latest_summary.txt", "w") as f:
-        f.write(summary)
+    write_text_atomic("latest_summary.txt", summary)
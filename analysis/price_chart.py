@@ -2,11 +2,17 @@
 # Description: Plots Bitcoin price (as moving average) and volume from Neo4j with 2-day filter and volume note
 
 import os
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import datetime
+from pathlib import Path
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
+from utils.rollup import fetch_price_series
+from analysis.indicators import IndicatorSet
+from utils.atomic import atomic_path
+from utils.queries import run_query
 
 # Load environment variables
 load_dotenv()
@@ -14,40 +20,100 @@ URI = os.getenv("NEO4J_URI")
 USER = os.getenv("NEO4J_USER")
 PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+# Indicator series (read by the dashboard) and the state needed to extend it
+INDICATOR_CSV = Path("btc_price_volume.csv")
+INDICATOR_STATE = Path("data/cache/indicator_state.json")
+
 # Neo4j driver
 driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
 
-def fetch_price_volume_data():
-    query = '''
-    MATCH (t:Transaction)
-    RETURN t.timestamp AS timestamp, t.price_usd AS price, t.volume_24h AS volume
-    ORDER BY t.timestamp
-    '''
+def fetch_price_volume_data(days=7):
+    # Older ranges come from hourly/daily rollups, recent ones from raw ticks
     with driver.session() as session:
-        result = session.run(query)
-        data = [{"timestamp": r["timestamp"], "price": r["price"], "volume": r["volume"]} for r in result]
-    return pd.DataFrame(data)
+        data = fetch_price_series(session, days=days)
+    return pd.DataFrame(data, columns=["timestamp", "price", "volume"])
 
-def plot_price_volume(df, output_file="btc_price_volume.png"):
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df.set_index("timestamp", inplace=True)
+def read_price_alerts(session, days=7):
+    """Price alerts raised by the ingest anomaly detector, for overlaying on the chart."""
+    since = (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat()
+    result = run_query(session, "price_alerts", since=since)
+    return pd.DataFrame([dict(r) for r in result], columns=["timestamp", "price", "direction"])
+
+def fetch_price_alerts(days=7):
+    with driver.session() as session:
+        return read_price_alerts(session, days)
 
-    # Filter to last 7 days
-    cutoff = datetime.datetime.now() - datetime.timedelta(days=7)
-    df = df[df.index >= cutoff].copy()
+def prepare_series(df, days=7):
+    """Parse, de-duplicate and window the raw points into a timestamp-indexed frame."""
+    df = df.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+    df.set_index("timestamp", inplace=True)
 
-    # Compute 5-point moving average for price
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=days)
+    df = df[df.index >= cutoff]
     df = df[~df.index.duplicated(keep="first")]
-    df = df.dropna(subset=["price"]).copy()
-    df["MA_5"] = df["price"].rolling(window=5).mean()
-    # print(df.head(10))
+    return df.dropna(subset=["price"])
+
+def load_cached_indicators(series):
+    """Return (cached rows, state) if the cache covers a prefix of `series`, else (None, None)."""
+    state = IndicatorSet.load(INDICATOR_STATE)
+    if state is None or not INDICATOR_CSV.exists() or series.empty:
+        return None, None
+    try:
+        cached = pd.read_csv(INDICATOR_CSV, index_col="timestamp")
+        cached.index = pd.to_datetime(cached.index, format="ISO8601")
+    except (ValueError, KeyError):
+        return None, None
+    if cached.empty or str(cached.index[-1].isoformat()) != state.last_timestamp:
+        return None, None
 
-    fig, ax1 = plt.subplots(figsize=(12, 6))
+    # Rows both sides know about must agree, otherwise history changed (e.g. retention rolled ticks up)
+    cached = cached[cached.index >= series.index[0]]
+    known = series[series.index <= cached.index[-1]] if len(cached) else series.iloc[:0]
+    if len(known) != len(cached) or not (known.index == cached.index).all() \
+            or not np.allclose(known["price"], cached["price"]):
+        return None, None
+    return cached, state
+
+def compute_indicators(series):
+    """Indicator frame for `series`, computing only points newer than the cached CSV."""
+    cached, state = load_cached_indicators(series)
+    if cached is None:
+        cached, state = series.iloc[:0], IndicatorSet()
+        print("🧮 Computing indicators from scratch...")
+    new = series[series.index > cached.index[-1]] if len(cached) else series
+    values = state.append([ts.isoformat() for ts in new.index], new["price"].to_numpy(), new["volume"].to_numpy())
+    frame = pd.concat([cached, new.assign(**values)])
+    frame.index.name = "timestamp"
+
+    if len(new):
+        with atomic_path(INDICATOR_CSV) as tmp:
+            frame.to_csv(tmp)
+        state.save(INDICATOR_STATE)
+    print(f"✅ Indicators: {len(cached)} cached + {len(new)} new point(s) -> {INDICATOR_CSV}")
+    return frame
+
+def plot_price_volume(df, output_file="btc_price_volume.png", alerts=None):
+    """Plot the indicator frame from compute_indicators(): 5-point SMA plus 24h volume bars."""
+    cutoff = df.index[0] if len(df) else datetime.datetime.now()
+
+    # Object-oriented Figure, not pyplot: no GUI backend or global "current figure", so it is safe on worker threads
+    fig = Figure(figsize=(12, 6))
+    ax1 = fig.subplots()
     ax1.set_xlabel("Timestamp")
     ax1.set_ylabel("Price (USD)", color="tab:red")
-    ax1.plot(df.index, df["MA_5"], color="tab:red", label="5-pt MA")
+    ax1.plot(df.index, df["sma_5"], color="tab:red", label="5-pt MA")
     ax1.tick_params(axis='y', labelcolor="tab:red")
 
+    # Overlay anomaly alerts at the tick price that triggered them
+    if alerts is not None and not alerts.empty:
+        alerts = alerts.assign(timestamp=pd.to_datetime(alerts["timestamp"], format="ISO8601"))
+        alerts = alerts[alerts["timestamp"] >= cutoff]
+        for direction, marker in (("up", "^"), ("down", "v")):
+            points = alerts[alerts["direction"] == direction]
+            ax1.scatter(points["timestamp"], points["price"], marker=marker, color="black", zorder=3,
+                        label=f"Alert ({direction})")
+
     # Plot volume bars if enough data
     ax2 = ax1.twinx()
     if len(df) >= 12:
@@ -58,16 +124,17 @@ def plot_price_volume(df, output_file="btc_price_volume.png"):
         ax2.set_yticks([])
         ax2.set_ylabel("Volume (insufficient data)", color="gray")
 
-    plt.title("Bitcoin Price (Moving Avg) and Volume - Last 7 Days")
+    ax1.set_title("Bitcoin Price (Moving Avg) and Volume - Last 7 Days")
     fig.tight_layout()
-    plt.savefig(output_file)
+    with atomic_path(output_file) as tmp:
+        fig.savefig(tmp)
     print(f"✅ Chart saved as {output_file}")
 
 if __name__ == "__main__":
     print("📡 Fetching BTC price/volume data...")
     df = fetch_price_volume_data()
     if not df.empty:
-        plot_price_volume(df)
+        plot_price_volume(compute_indicators(prepare_series(df)), alerts=fetch_price_alerts())
     else:
         print("⚠️ No data found in Neo4j.")
     driver.close()
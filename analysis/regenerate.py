@@ -0,0 +1,141 @@
+# File: analysis/regenerate.py
+# Description: Regenerates the dashboard artifacts (price chart + indicators, summary, wallet graph) from one read snapshot, in parallel
+
+import os
+import json
+import time
+import datetime
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import pandas as pd
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+from utils.data_version import get_data_versions
+from utils.rollup import fetch_price_series, fetch_daily_prices
+from utils.atomic import write_text_atomic
+from analysis.price_chart import read_price_alerts, prepare_series, compute_indicators, plot_price_volume
+from analysis.langchain_summary import read_top_wallets, summarize_data, WALLET_SAMPLE
+from analysis.graph_pyvis import read_graph_edges, create_pyvis_graph
+
+# Load environment variables
+load_dotenv()
+URI = os.getenv("NEO4J_URI")
+USER = os.getenv("NEO4J_USER")
+PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+DAYS = 7
+GRAPH_EDGE_LIMIT = 200
+SUMMARY_FILE = "latest_summary.txt"
+TIMINGS_FILE = Path("data/metrics/regen_timings.jsonl")
+
+# Connect to Neo4j
+driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
+
+
+def read_snapshot(tx):
+    """Every input the artifacts need, read inside one transaction so they all describe the same data."""
+    return {
+        "versions": get_data_versions(tx),
+        "price_series": fetch_price_series(tx, days=DAYS),
+        "price_alerts": read_price_alerts(tx, days=DAYS),
+        "daily_prices": [dict(r, day=str(r["day"])) for r in fetch_daily_prices(tx, days=DAYS)],
+        "wallets": [dict(r) for r in read_top_wallets(tx, WALLET_SAMPLE)],
+        "edges": read_graph_edges(tx, GRAPH_EDGE_LIMIT),
+    }
+
+
+def build_price_chart(snapshot, use_llm=False):
+    df = pd.DataFrame(snapshot["price_series"], columns=["timestamp", "price", "volume"])
+    if df.empty:
+        return "no price data"
+    frame = compute_indicators(prepare_series(df, days=DAYS))
+    plot_price_volume(frame, alerts=snapshot["price_alerts"])
+    return f"{len(frame)} points"
+
+
+def build_summary(snapshot, use_llm=False):
+    summary = summarize_data(snapshot["daily_prices"], snapshot["wallets"], use_llm=use_llm)
+    write_text_atomic(SUMMARY_FILE, summary)
+    return f"{len(summary)} chars"
+
+
+def build_wallet_graph(snapshot, use_llm=False):
+    create_pyvis_graph(snapshot["edges"])
+    return f"{len(snapshot['edges'])} edges"
+
+
+ARTIFACTS = {
+    "price_chart": build_price_chart,
+    "summary": build_summary,
+    "wallet_graph": build_wallet_graph,
+}
+
+
+def timed_build(name, snapshot, use_llm):
+    """Worker: build one artifact and return (name, seconds, detail, error)."""
+    started = time.perf_counter()
+    try:
+        detail, error = ARTIFACTS[name](snapshot, use_llm), None
+    except Exception as e:
+        detail, error = None, f"{type(e).__name__}: {e}"
+    return name, time.perf_counter() - started, detail, error
+
+
+def record_timings(rows):
+    TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    at = datetime.datetime.now().isoformat()
+    with open(TIMINGS_FILE, "a") as f:
+        for artifact, seconds, ok in rows:
+            f.write(json.dumps({"at": at, "artifact": artifact, "seconds": round(seconds, 4), "ok": ok}) + "\n")
+
+
+def regenerate(artifacts=tuple(ARTIFACTS), workers=3, processes=False, use_llm=False):
+    """Take one snapshot, build the artifacts concurrently and return True if all succeeded."""
+    started = time.perf_counter()
+    print("📡 Reading snapshot from Neo4j...")
+    with driver.session() as session:
+        snapshot = session.execute_read(read_snapshot)
+    snapshot_seconds = time.perf_counter() - started
+    print(f"📸 Snapshot at data versions {snapshot['versions']} in {snapshot_seconds:.2f}s")
+
+    if processes:
+        # Spawned workers do not inherit this process's driver
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+    timings = [("snapshot", snapshot_seconds, True)]
+    with pool:
+        futures = [pool.submit(timed_build, name, snapshot, use_llm) for name in artifacts]
+        for future in as_completed(futures):
+            name, seconds, detail, error = future.result()
+            timings.append((name, seconds, error is None))
+            if error:
+                print(f"❌ {name} failed after {seconds:.2f}s: {error}")
+            else:
+                print(f"✅ {name} built in {seconds:.2f}s ({detail})")
+
+    total = time.perf_counter() - started
+    timings.append(("total", total, all(ok for _, _, ok in timings)))
+    record_timings(timings)
+    print(f"⏱️ Regeneration finished in {total:.2f}s")
+    return timings[-1][2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate dashboard artifacts from one consistent snapshot")
+    parser.add_argument("artifacts", nargs="*", metavar="ARTIFACT",
+                        help=f"Artifacts to build: {', '.join(ARTIFACTS)} (default: all)")
+    parser.add_argument("--workers", type=int, default=len(ARTIFACTS))
+    parser.add_argument("--processes", action="store_true", help="Use worker processes instead of threads")
+    parser.add_argument("--llm", action="store_true", help="Paraphrase the summary with the local LLM")
+    args = parser.parse_args()
+    unknown = set(args.artifacts) - set(ARTIFACTS)
+    if unknown:
+        parser.error(f"unknown artifact(s): {', '.join(sorted(unknown))}")
+
+    ok = regenerate(args.artifacts or list(ARTIFACTS), args.workers, args.processes, args.llm)
+    driver.close()
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,146 @@
+# File: analysis/stats_engine.py
+# Description: Deterministic NumPy/pandas price and wallet statistics with a template renderer (no LLM required)
+
+import numpy as np
+import pandas as pd
+
+DAYS_PER_YEAR = 365  # Bitcoin trades every day
+
+
+def price_frame(price_data):
+    """Daily rows from fetch_prices() as a DataFrame indexed by day."""
+    df = pd.DataFrame([dict(r) for r in price_data], columns=["day", "avg_price", "max_price", "min_price"])
+    df["day"] = df["day"].astype(str)
+    return df.dropna(subset=["avg_price"]).set_index("day")
+
+
+def compute_price_facts(price_data):
+    """Trend, change, volatility, drawdown and range-break facts over the daily price series."""
+    df = price_frame(price_data)
+    if df.empty:
+        return None
+
+    avg = df["avg_price"].to_numpy(dtype=float)
+    highs = df["max_price"].to_numpy(dtype=float)
+    lows = df["min_price"].to_numpy(dtype=float)
+    days = len(avg)
+
+    facts = {
+        "days": days,
+        "start_day": df.index[0],
+        "end_day": df.index[-1],
+        "start_price": avg[0],
+        "end_price": avg[-1],
+        "pct_change": (avg[-1] / avg[0] - 1) * 100,
+        "period_high": highs.max(),
+        "period_high_day": df.index[int(highs.argmax())],
+        "period_low": lows.min(),
+        "period_low_day": df.index[int(lows.argmin())],
+        "slope_per_day": 0.0,
+        "slope_pct_per_day": 0.0,
+        "trend_r2": 0.0,
+        "daily_volatility_pct": 0.0,
+        "annualized_volatility_pct": 0.0,
+        "max_drawdown_pct": 0.0,
+        "breakout": False,
+        "breakdown": False,
+    }
+
+    if days >= 2:
+        x = np.arange(days, dtype=float)
+        slope, intercept = np.polyfit(x, avg, 1)
+        fitted = slope * x + intercept
+        ss_tot = ((avg - avg.mean()) ** 2).sum()
+        facts["slope_per_day"] = slope
+        facts["slope_pct_per_day"] = slope / avg.mean() * 100
+        facts["trend_r2"] = 1 - ((avg - fitted) ** 2).sum() / ss_tot if ss_tot else 0.0
+
+        # Peak-to-trough: lowest low relative to the highest high seen up to that day
+        drawdowns = lows / np.maximum.accumulate(highs) - 1
+        facts["max_drawdown_pct"] = drawdowns.min() * 100
+
+        facts["breakout"] = bool(highs[-1] > highs[:-1].max())
+        facts["breakdown"] = bool(lows[-1] < lows[:-1].min())
+
+    if days >= 3:
+        returns = np.diff(np.log(avg))
+        daily_vol = returns.std(ddof=1)
+        facts["daily_volatility_pct"] = daily_vol * 100
+        facts["annualized_volatility_pct"] = daily_vol * np.sqrt(DAYS_PER_YEAR) * 100
+
+    return {k: v.item() if isinstance(v, np.generic) else v for k, v in facts.items()}
+
+
+def compute_wallet_facts(wallet_data, top_n=3):
+    """Top receivers plus concentration (top-n share, HHI, Gini) over the received counts given."""
+    counts = pd.Series({w["address"]: w["received_count"] for w in wallet_data}, dtype=float).sort_values(ascending=False)
+    total = counts.sum()
+    if counts.empty or total == 0:
+        return None
+
+    shares = counts.to_numpy() / total
+    ordered = np.sort(counts.to_numpy())
+    n = len(ordered)
+    gini = (2 * np.arange(1, n + 1) - n - 1).dot(ordered) / (n * ordered.sum()) if n > 1 else 0.0
+
+    return {
+        "wallets": n,
+        "total_received": int(total),
+        "top": [(address, int(count)) for address, count in counts.head(top_n).items()],
+        "top_share_pct": float(shares[:top_n].sum() * 100),
+        "hhi": float((shares ** 2).sum()),
+        "gini": float(gini),
+    }
+
+
+def compute_facts(price_data, wallet_data, top_n=3):
+    return {"price": compute_price_facts(price_data), "wallets": compute_wallet_facts(wallet_data, top_n)}
+
+
+def describe_trend(price):
+    if price["days"] < 2:
+        return "flat (not enough days to fit a trend)"
+    direction = "upward" if price["slope_per_day"] > 0 else "downward"
+    strength = "strong" if price["trend_r2"] >= 0.7 else "moderate" if price["trend_r2"] >= 0.3 else "weak"
+    return f"{strength} {direction} ({price['slope_per_day']:+,.2f} USD/day, {price['slope_pct_per_day']:+.2f}%/day, R²={price['trend_r2']:.2f})"
+
+
+def render_summary(facts):
+    """Plain-text summary built only from computed facts."""
+    lines = []
+    price = facts.get("price")
+    if price:
+        lines.append(
+            f"Over {price['days']} day(s) ({price['start_day']} to {price['end_day']}), the daily average Bitcoin price "
+            f"moved from ${price['start_price']:,.2f} to ${price['end_price']:,.2f} ({price['pct_change']:+.2f}%)."
+        )
+        lines.append(f"Trend: {describe_trend(price)}.")
+        lines.append(
+            f"Range: high ${price['period_high']:,.2f} on {price['period_high_day']}, "
+            f"low ${price['period_low']:,.2f} on {price['period_low_day']}; "
+            f"max drawdown {price['max_drawdown_pct']:.2f}%."
+        )
+        if price["days"] >= 3:
+            lines.append(
+                f"Realized volatility: {price['daily_volatility_pct']:.2f}% daily "
+                f"({price['annualized_volatility_pct']:.1f}% annualized)."
+            )
+        if price["breakout"]:
+            lines.append("The latest day broke above the prior range high.")
+        if price["breakdown"]:
+            lines.append("The latest day broke below the prior range low.")
+    else:
+        lines.append("No price data available for the selected period.")
+
+    wallets = facts.get("wallets")
+    if wallets:
+        top = ", ".join(f"{address} ({count})" for address, count in wallets["top"])
+        lines.append(f"Most active receivers: {top}.")
+        lines.append(
+            f"The top {len(wallets['top'])} of {wallets['wallets']} wallets account for {wallets['top_share_pct']:.1f}% "
+            f"of {wallets['total_received']} receipts (HHI {wallets['hhi']:.3f}, Gini {wallets['gini']:.2f})."
+        )
+    else:
+        lines.append("No wallet activity recorded yet.")
+
+    return "\n".join(lines)
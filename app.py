@@ -1,52 +1,52 @@
 # File: app.py
 # Description: Streamlit dashboard with modularized tabs and Neo4j queries
 
+import time
+_run_started = time.perf_counter()
+
+import importlib
+import threading
 import streamlit as st
-import streamlit.components.v1 as components
-import os
 from datetime import datetime
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
+from ui.utils.timing import record_run
+
+# View label -> tab module. Modules are imported on first use, so only the active
+# view pays for its dependencies (langchain, pandas, altair, the Neo4j driver...).
+VIEWS = {
+    "📈 Price Chart": "ui.tabs.price_chart",
+    "🔗 Wallet Graph": "ui.tabs.wallet_graph",
+    "🧠 Summary": "ui.tabs.summary_tab",
+    "📊 Stats": "ui.tabs.stats_tab",
+    "💬 Query Explorer": "ui.tabs.query_explorer",
+}
 
-# Import tab renderers
-from ui.tabs import price_chart, wallet_graph, summary_tab, stats_tab, query_explorer
 
-# Load environment variables and connect to Neo4j
-load_dotenv()
-URI = os.getenv("NEO4J_URI")
-USER = os.getenv("NEO4J_USER")
-PASSWORD = os.getenv("NEO4J_PASSWORD")
-driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
+@st.cache_resource
+def warm_up_query_plans():
+    """Once per server process: EXPLAIN every registered query in the background so first loads skip planning."""
+    from ui.utils.helpers import driver
+    from utils.queries import warm_up
+    thread = threading.Thread(target=warm_up, args=(driver,), daemon=True)
+    thread.start()
+    return thread
+
 
 # UI setup
 st.set_page_config(page_title="Bitcoin Analytics Dashboard", layout="wide")
 st.title("Real-time Bitcoin Analytics Dashboard")
+warm_up_query_plans()
 
-# Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📈 Price Chart",
-    "🔗 Wallet Graph",
-    "🧠 Summary",
-    "📊 Stats",
-    "💬 Query Explorer"
-])
-
-# Render each tab
-with tab1:
-    price_chart.render()
-
-with tab2:
-    wallet_graph.render()
-
-with tab3:
-    summary_tab.render()
-
-with tab4:
-    stats_tab.render()
+# Unlike st.tabs, which executes every tab's body on each rerun, only the selected view renders.
+# The selection is kept in the URL so reloads and shared links open the same view.
+labels = list(VIEWS)
+requested = st.query_params.get("view")
+default_index = labels.index(requested) if requested in labels else 0
+view = st.radio("View", labels, index=default_index, horizontal=True, label_visibility="collapsed", key="view")
+st.query_params.update({"view": view})
 
-with tab5:
-    query_explorer.render()
+importlib.import_module(VIEWS[view]).render()
 
 # Footer
 st.markdown("---")
-st.caption(f"Last refreshed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+kind, seconds = record_run(view, _run_started, st.session_state)
+st.caption(f"Last refreshed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} · {kind.replace('_', ' ')} in {seconds * 1000:.0f} ms")
@@ -0,0 +1,174 @@
+# File: ingest/anomaly.py
+# Description: Incremental (O(1) per tick) anomaly detection on price and 24h volume with persisted detector state
+
+import bisect
+import datetime
+import json
+import math
+import os
+from collections import deque
+from pathlib import Path
+
+STATE_FILE = Path("data/state/anomaly_detector.json")
+METRICS = ("price_usd", "volume_24h")
+
+# Detectors run on tick-to-tick log changes, so a steady trend in the level is not itself an anomaly
+EWMA_ALPHA = 0.05
+EWMA_Z = 4.0
+MAD_WINDOW = 120
+MAD_Z = 5.0
+CUSUM_K = 0.5      # slack, in EWMA standard deviations
+CUSUM_H = 8.0      # decision threshold, in EWMA standard deviations
+WARMUP = 30        # ticks before any detector may fire
+MIN_SCALE = 1e-5   # floor for the std/MAD of log changes (flat feeds would otherwise flag every move)
+MIN_MOVE = 1e-3    # EWMA/MAD alerts also need an absolute move of at least ~0.1%
+
+
+class MetricDetector:
+    """EWMA z-score, rolling median/MAD z-score and two-sided CUSUM over one metric's log changes."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.last = state.get("last")
+        self.count = state.get("count", 0)
+        self.mean = state.get("mean", 0.0)
+        self.var = state.get("var", 0.0)
+        self.cusum_pos = state.get("cusum_pos", 0.0)
+        self.cusum_neg = state.get("cusum_neg", 0.0)
+        self.window = deque((v for v in state.get("window", []) if v != 0), maxlen=MAD_WINDOW)
+        self.sorted_window = sorted(self.window)
+
+    def to_dict(self):
+        return {
+            "last": self.last, "count": self.count, "mean": self.mean, "var": self.var,
+            "cusum_pos": self.cusum_pos, "cusum_neg": self.cusum_neg, "window": list(self.window),
+        }
+
+    def _median(self):
+        n = len(self.sorted_window)
+        mid = n // 2
+        return self.sorted_window[mid] if n % 2 else (self.sorted_window[mid - 1] + self.sorted_window[mid]) / 2
+
+    def _mad(self, median):
+        # Bounded window, so this is constant work per tick
+        deviations = sorted(abs(v - median) for v in self.window)
+        n = len(deviations)
+        mid = n // 2
+        return deviations[mid] if n % 2 else (deviations[mid - 1] + deviations[mid]) / 2
+
+    def update(self, value):
+        """Feed one observation; return a list of (detector, change, score, threshold) that fired."""
+        if value is None or value <= 0:
+            return []
+        if self.last is None:
+            self.last = value
+            return []
+
+        change = math.log(value / self.last)
+        self.last = value
+        if change == 0:
+            # Repeated polls of an unchanged value carry no information; counting them would
+            # collapse the MAD (and EWMA variance) to zero and turn every real move into an outlier
+            return []
+        fired = []
+
+        # Score against the state *before* this tick so an outlier cannot mask itself
+        if self.count >= WARMUP:
+            std = max(math.sqrt(self.var), MIN_SCALE)
+            z = (change - self.mean) / std
+            big_move = abs(change) >= MIN_MOVE
+            if big_move and abs(z) >= EWMA_Z:
+                fired.append(("ewma", change, z, EWMA_Z))
+
+            median = self._median()
+            # A zero MAD (quantized or mostly identical moves) says nothing about scale; use the EWMA std instead
+            mad = 1.4826 * self._mad(median)
+            robust_z = (change - median) / (mad if mad >= MIN_SCALE else std)
+            if big_move and abs(robust_z) >= MAD_Z:
+                fired.append(("mad", change, robust_z, MAD_Z))
+
+            self.cusum_pos = max(0.0, self.cusum_pos + z - CUSUM_K)
+            self.cusum_neg = max(0.0, self.cusum_neg - z - CUSUM_K)
+            if self.cusum_pos >= CUSUM_H or self.cusum_neg >= CUSUM_H:
+                score = self.cusum_pos if self.cusum_pos >= self.cusum_neg else -self.cusum_neg
+                fired.append(("cusum", change, score, CUSUM_H))
+                self.cusum_pos = self.cusum_neg = 0.0
+
+        # EWMA mean/variance (West's incremental form)
+        diff = change - self.mean
+        increment = EWMA_ALPHA * diff
+        self.mean += increment
+        self.var = (1 - EWMA_ALPHA) * (self.var + diff * increment)
+        self.count += 1
+
+        if len(self.window) == self.window.maxlen:
+            self.sorted_window.pop(bisect.bisect_left(self.sorted_window, self.window[0]))
+        self.window.append(change)
+        bisect.insort(self.sorted_window, change)
+
+        return fired
+
+
+class AnomalyDetector:
+    """Per-metric detectors plus the last processed timestamp, so replayed ticks are skipped."""
+
+    def __init__(self, state_file=STATE_FILE):
+        self.state_file = Path(state_file)
+        state = {}
+        if self.state_file.exists():
+            try:
+                state = json.loads(self.state_file.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Could not read detector state, starting fresh: {e}")
+        self.last_timestamp = state.get("last_timestamp")
+        self.detectors = {m: MetricDetector(state.get("metrics", {}).get(m)) for m in METRICS}
+
+    def process(self, ticks):
+        """Run the detectors over a batch of tick dicts in order and return the alerts they raised."""
+        alerts = []
+        for tick in ticks:
+            timestamp = tick.get("timestamp")
+            if not timestamp or (self.last_timestamp and timestamp <= self.last_timestamp):
+                continue
+            self.last_timestamp = timestamp
+            for metric, detector in self.detectors.items():
+                for name, change, score, threshold in detector.update(tick.get(metric)):
+                    alerts.append({
+                        "timestamp": timestamp,
+                        "metric": metric,
+                        "detector": name,
+                        "value": tick.get(metric),
+                        "change_pct": (math.exp(change) - 1) * 100,
+                        "score": score,
+                        "threshold": threshold,
+                        "direction": "up" if score > 0 else "down",
+                    })
+        return alerts
+
+    def snapshot(self):
+        return {
+            "last_timestamp": self.last_timestamp,
+            "metrics": {m: d.to_dict() for m, d in self.detectors.items()},
+        }
+
+    def restore(self, snapshot):
+        """Roll back to a snapshot(), e.g. when the batch processed since then could not be stored."""
+        self.last_timestamp = snapshot["last_timestamp"]
+        self.detectors = {m: MetricDetector(snapshot["metrics"].get(m)) for m in METRICS}
+
+    def save(self):
+        """Atomically persist detector state (call after the batch it covers was committed)."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, self.state_file)
+
+
+def alert_statement(alerts):
+    """Write-path statement storing alerts as Alert nodes linked to their triggering Transaction; idempotent on replay."""
+    return ("create_alerts", alerts, {"now": datetime.datetime.now().isoformat()})
+
+
+def format_alert(alert):
+    return (f"🚨 {alert['metric']} {alert['direction']} {alert['change_pct']:+.3f}% at {alert['timestamp']} "
+            f"({alert['detector']} score {alert['score']:+.1f})")
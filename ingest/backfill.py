@@ -0,0 +1,178 @@
+# File: ingest/backfill.py
+# Description: Parallel, resumable import of historical price/volume dumps (CoinGecko market_chart JSON or CSV) into Neo4j
+
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+CHECKPOINT_DIR = Path("data/backfill")
+CHUNK_SIZE = 20_000
+BATCH_SIZE = 5_000
+WORKERS = 4
+
+
+def to_iso(value):
+    """Normalize epoch seconds/milliseconds or ISO strings to the naive local ISO format used by fetch_transactions."""
+    try:
+        epoch = float(value)
+    except (TypeError, ValueError):
+        ts = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if ts.tzinfo:
+            ts = ts.astimezone().replace(tzinfo=None)
+        return ts.isoformat()
+    if epoch > 1e11:  # milliseconds
+        epoch /= 1000
+    return datetime.datetime.fromtimestamp(epoch).isoformat()
+
+
+def parse_float(value):
+    return float(value) if value not in (None, "") else None
+
+
+def load_coingecko(path):
+    """Rows from a `/coins/{id}/market_chart/range` response: prices, market_caps and total_volumes keyed by ms."""
+    with open(path) as f:
+        data = json.load(f)
+    caps = {int(ms): v for ms, v in data.get("market_caps", [])}
+    volumes = {int(ms): v for ms, v in data.get("total_volumes", [])}
+    return [
+        {
+            "timestamp": to_iso(int(ms)),
+            "price_usd": price,
+            "market_cap": caps.get(int(ms)),
+            "volume_24h": volumes.get(int(ms)),
+        }
+        for ms, price in data.get("prices", [])
+    ]
+
+
+def load_csv(path):
+    """Rows from a CSV with a timestamp column plus price_usd/price, market_cap and volume_24h/volume."""
+    rows = []
+    with open(path, newline="") as f:
+        for record in csv.DictReader(f):
+            rows.append({
+                "timestamp": to_iso(record["timestamp"]),
+                "price_usd": parse_float(record.get("price_usd", record.get("price"))),
+                "market_cap": parse_float(record.get("market_cap")),
+                "volume_24h": parse_float(record.get("volume_24h", record.get("volume"))),
+            })
+    return rows
+
+
+def load_rows(paths):
+    """Load, de-duplicate by timestamp and sort all input files."""
+    by_ts = {}
+    for path in paths:
+        loader = load_csv if path.suffix.lower() == ".csv" else load_coingecko
+        for row in loader(path):
+            by_ts[row["timestamp"]] = row
+    return [by_ts[ts] for ts in sorted(by_ts)]
+
+
+def dataset_id(paths, chunk_size):
+    digest = hashlib.sha256(str(chunk_size).encode())
+    for path in sorted(paths):
+        stat = path.stat()
+        digest.update(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def load_checkpoint(path):
+    if not path.exists():
+        return set()
+    with open(path) as f:
+        return set(json.load(f)["done"])
+
+
+def save_checkpoint(path, done):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"done": sorted(done)}, f)
+    tmp.replace(path)
+
+
+def write_chunk(chunk_id, rows, batch_size):
+    """Worker: write one chunk as batched UNWIND transactions on this process's own driver."""
+    from ingest.push_to_neo4j import driver, create_transaction_nodes
+
+    with driver.session() as session:
+        for start in range(0, len(rows), batch_size):
+            session.execute_write(create_transaction_nodes, rows[start:start + batch_size])
+    return chunk_id, len(rows)
+
+
+def write_admin_csv(rows, out_dir):
+    """Emit node files for a first-time `neo4j-admin database import full` load."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    header = out_dir / "transactions_header.csv"
+    body = out_dir / "transactions.csv"
+    with open(header, "w", newline="") as f:
+        csv.writer(f).writerow(["timestamp:ID(Transaction)", "price_usd:double", "market_cap:double", "volume_24h:double"])
+    with open(body, "w", newline="") as f:
+        writer = csv.writer(f)
+        for row in rows:
+            writer.writerow([row["timestamp"], row["price_usd"], row["market_cap"], row["volume_24h"]])
+    return header, body
+
+
+def backfill(paths, workers=WORKERS, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE):
+    rows = load_rows(paths)
+    chunks = {i // chunk_size: rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)}
+
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    checkpoint = CHECKPOINT_DIR / f"{dataset_id(paths, chunk_size)}.json"
+    done = load_checkpoint(checkpoint)
+    pending = {cid: chunk for cid, chunk in chunks.items() if cid not in done}
+
+    total = sum(len(c) for c in pending.values())
+    print(f"📦 {len(rows)} rows in {len(chunks)} chunk(s); {len(chunks) - len(pending)} already imported, "
+          f"{len(pending)} to go ({total} rows) with {workers} worker(s)")
+    if not pending:
+        return
+
+    from ingest.push_to_neo4j import driver, ensure_schema
+    with driver.session() as session:
+        ensure_schema(session)
+    driver.close()
+
+    written = 0
+    start = time.perf_counter()
+    # spawn: workers must not inherit the parent's driver connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(write_chunk, cid, chunk, batch_size) for cid, chunk in pending.items()]
+        for future in as_completed(futures):
+            chunk_id, count = future.result()
+            done.add(chunk_id)
+            save_checkpoint(checkpoint, done)
+
+            written += count
+            elapsed = time.perf_counter() - start
+            rate = written / elapsed if elapsed else 0
+            eta = (total - written) / rate if rate else 0
+            print(f"🚀 chunk {chunk_id} done | {written}/{total} rows | {rate:,.0f} rows/s | ETA {eta:,.0f}s")
+
+    print(f"✅ Backfilled {written} rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import historical BTC price/volume data into Neo4j")
+    parser.add_argument("files", nargs="+", type=Path, help="CoinGecko market_chart/range JSON dumps or CSV files")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per UNWIND transaction")
+    parser.add_argument("--admin-csv", type=Path, metavar="DIR", help="Write neo4j-admin import CSVs instead of loading via Bolt")
+    args = parser.parse_args()
+
+    if args.admin_csv:
+        header, body = write_admin_csv(load_rows(args.files), args.admin_csv)
+        print(f"✅ Wrote {body}. Load into an empty database with:")
+        print(f"   neo4j-admin database import full --nodes=Transaction={header},{body} neo4j")
+    else:
+        backfill(args.files, args.workers, args.chunk_size, args.batch_size)
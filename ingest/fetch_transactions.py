@@ -1,10 +1,10 @@
 # File: ingest/fetch_transactions.py
-# Description: Periodically fetches real-time Bitcoin price and volume data from CoinGecko and saves it to disk
+# Description: Periodically fetches real-time Bitcoin price and volume data from CoinGecko and appends it to the segment log
 
 import requests
 import datetime
 import json
-from pathlib import Path
+from ingest.segment_log import SegmentLog
 
 def fetch_bitcoin_data():
     url = "https://api.coingecko.com/api/v3/coins/bitcoin"
@@ -30,13 +30,7 @@ def fetch_bitcoin_data():
         return None
 
 if __name__ == "__main__":
-    out_dir = Path("data/raw")
-    out_dir.mkdir(parents=True, exist_ok=True)
-
     data = fetch_bitcoin_data()
     if data:
-        ts = data["timestamp"].replace(":", "_")
-        out_path = out_dir / f"{ts}.json"
-        with open(out_path, "w") as f:
-            json.dump(data, f, indent=2)
-        print(f"✅ Saved to {out_path}")
+        segment = SegmentLog().append(data)
+        print(f"✅ Appended to {segment}")
@@ -1,11 +1,13 @@
 # File: ingest/push_to_neo4j.py
-# Description: Reads fetched Bitcoin data from disk and pushes it to the Neo4j database as Transaction nodes
+# Description: Reads fetched Bitcoin data from the segment log and pushes it to the Neo4j database as Transaction nodes
 
 import os
-import json
-from pathlib import Path
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
+from ingest.segment_log import SegmentLog
+from ingest.anomaly import AnomalyDetector, alert_statement, format_alert
+from ingest.write_path import WritePath, TRANSIENT_ERRORS, WRITTEN, SPILLED, DEAD_LETTERED, apply_statements
+from utils.data_version import ensure_data_version_schema
 
 # Load environment variables
 load_dotenv()
@@ -13,46 +15,70 @@ URI = os.getenv("NEO4J_URI")
 USER = os.getenv("NEO4J_USER")
 PASSWORD = os.getenv("NEO4J_PASSWORD")
 
-# Paths
-raw_dir = Path("data/raw")
-log_file = Path("data/pushed_files.txt")
-log_file.parent.mkdir(parents=True, exist_ok=True)
-log_file.touch(exist_ok=True)
+CONSUMER = "neo4j"
+BATCH_SIZE = 500
 
 # Connect to Neo4j
 driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
 
-def create_transaction_node(tx, data):
-    query = """
-    MERGE (t:Transaction {timestamp: $timestamp})
-    SET t.price_usd = $price_usd,
-        t.market_cap = $market_cap,
-        t.volume_24h = $volume_24h
-    """
-    tx.run(query, **data)
+def tick_statements(rows, alerts=()):
+    """Write-path statements and data-version scopes for a batch of ticks plus any alerts they triggered."""
+    statements, scopes = [("upsert_ticks", rows)], ["transactions"]
+    if alerts:
+        statements.append(alert_statement(alerts))
+        scopes.append("alerts")
+    return statements, scopes
 
-def ingest_new_files():
-    with open(log_file, "r") as f:
-        pushed = set(line.strip() for line in f.readlines())
+def create_transaction_nodes(tx, rows, alerts=()):
+    """Upsert a batch of ticks in a single UNWIND statement, plus any alerts they triggered."""
+    apply_statements(tx, *tick_statements(rows, alerts))
 
-    json_files = sorted(raw_dir.glob("*.json"))
+def ensure_schema(session):
+    # Batched MERGE on timestamp needs an index, otherwise every row scans all Transactions
+    session.run("CREATE INDEX transaction_timestamp IF NOT EXISTS FOR (t:Transaction) ON (t.timestamp)")
+    session.run("CREATE INDEX alert_timestamp IF NOT EXISTS FOR (a:Alert) ON (a.timestamp)")
+    ensure_data_version_schema(session)
 
-    with driver.session() as session:
-        for file in json_files:
-            if file.name in pushed:
-                continue
+def push_batch(write_path, log, detector, rows, position):
+    alerts = detector.process(rows)
+    outcome = write_path.write(*tick_statements(rows, alerts))
+    # Spilled and dead-lettered batches are durable too, so the offset advances past them either way
+    # (a batch Neo4j rejects is parked instead of stalling the pusher on every run). Any other error
+    # propagates and leaves the offset where it was.
+    # State is saved before the offset, so a crash in between replays ticks the detector already skips
+    detector.save()
+    log.commit_offset(CONSUMER, position)
+    verb = {WRITTEN: "Ingested", SPILLED: "Spilled", DEAD_LETTERED: "Dead-lettered"}[outcome]
+    print(f"🚀 {verb} {len(rows)} tick(s) up to segment {position[0]} @ {position[1]}")
+    for alert in alerts:
+        print(format_alert(alert))
 
-            try:
-                with open(file) as f:
-                    data = json.load(f)
-                print(f"🚀 Ingesting {file.name}")
-                session.execute_write(create_transaction_node, data)
+def ingest_from_log(batch_size=BATCH_SIZE):
+    """Push everything after the committed offset through the write path (retry, circuit breaker, spill)."""
+    log = SegmentLog()
+    detector = AnomalyDetector()
+    write_path = WritePath(driver)
+    rows, position = [], None
 
-                with open(log_file, "a") as log:
-                    log.write(f"{file.name}\n")
+    if write_path.breaker.allow():
+        try:
+            with driver.session() as session:
+                ensure_schema(session)
+        except TRANSIENT_ERRORS as e:
+            print(f"⚠️ Could not ensure schema, Neo4j unavailable: {e}")
 
-            except Exception as e:
-                print(f"❌ Failed to push {file.name}: {e}")
+    try:
+        for record, position in log.read_from(log.load_offset(CONSUMER)):
+            rows.append(record)
+            if len(rows) >= batch_size:
+                push_batch(write_path, log, detector, rows, position)
+                rows = []
+        if rows:
+            push_batch(write_path, log, detector, rows, position)
+        # Drain anything spilled by earlier runs even when there were no new ticks
+        write_path.replay()
+    except Exception as e:
+        print(f"❌ Failed to push {len(rows)} tick(s), will resume from last committed offset: {e}")
 
 if __name__ == "__main__":
-    ingest_new_files()
+    ingest_from_log()
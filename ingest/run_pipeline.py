@@ -1,23 +1,27 @@
 # File: ingest/run_pipeline.py
 # Description: Runs the ingestion and push scripts in parallel using threads and handles graceful shutdown
 
+import argparse
 import threading
 import subprocess
 import time
 import signal
 import sys
 
-FETCH_SCRIPT = "ingest/fetch_transactions.py"
-PUSH_SCRIPT = "ingest/push_to_neo4j.py"
-SIMULATE_SCRIPT = "ingest/simulate_wallets.py"
+# Scripts run as modules from the repo root so they can import each other
+FETCH_SCRIPT = "ingest.fetch_transactions"
+PUSH_SCRIPT = "ingest.push_to_neo4j"
+SIMULATE_SCRIPT = "ingest.simulate_wallets"
+STREAM_SCRIPT = "ingest.stream_ingest"
 INTERVAL_SECONDS = 60
+RESTART_SECONDS = 5
 
 shutdown_flag = threading.Event()
 
-def run_script(script, label, interval=INTERVAL_SECONDS):
+def run_script(script, label, interval=INTERVAL_SECONDS, args=()):
     while not shutdown_flag.is_set():
         print(f"🚀 Running {label}...")
-        process = subprocess.Popen(["python", script])
+        process = subprocess.Popen(["python", "-m", script, *args])
 
         try:
             process.wait()
@@ -40,16 +44,27 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Bitcoin ingestion pipeline")
+    parser.add_argument("--stream", metavar="FEED", help="Consume a push feed (e.g. tcp://localhost:9100) instead of polling")
+    cli_args = parser.parse_args()
+
     print("🚦 Starting pipeline with threads...")
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    threads = [
-        threading.Thread(target=run_script, args=(FETCH_SCRIPT, "Fetch Script")),
-        threading.Thread(target=run_script, args=(PUSH_SCRIPT, "Push Script")),
-        threading.Thread(target=run_script, args=(SIMULATE_SCRIPT, "Simulate Script", 300))
-    ]
+    if cli_args.stream:
+        # The stream consumer is long-running; it is only restarted if it exits
+        threads = [
+            threading.Thread(target=run_script, args=(STREAM_SCRIPT, "Stream Ingest", RESTART_SECONDS, ("--feed", cli_args.stream))),
+            threading.Thread(target=run_script, args=(SIMULATE_SCRIPT, "Simulate Script", 300))
+        ]
+    else:
+        threads = [
+            threading.Thread(target=run_script, args=(FETCH_SCRIPT, "Fetch Script")),
+            threading.Thread(target=run_script, args=(PUSH_SCRIPT, "Push Script")),
+            threading.Thread(target=run_script, args=(SIMULATE_SCRIPT, "Simulate Script", 300))
+        ]
 
     for t in threads:
         t.start()
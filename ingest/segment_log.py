@@ -0,0 +1,173 @@
+# File: ingest/segment_log.py
+# Description: Rotating append-only JSONL segment log with persisted consumer offsets, replacing one-file-per-tick in data/raw
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+LOG_DIR = Path("data/log")
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+SEGMENT_MAX_AGE = 3600  # seconds; retention drops whole segments, so this is also its granularity
+COMPRESS_SEALED = os.getenv("SEGMENT_LOG_COMPRESS", "0") == "1"
+
+
+class SegmentLog:
+    """Append-only log split into segments named `<seq>-<created_epoch>.jsonl[.gz]`.
+
+    A read position is `(seq, byte_offset)` into the uncompressed segment, so a
+    consumer resumes with a single open + seek. Only the newest segment is ever
+    appended to; older ("sealed") segments are optionally gzipped.
+    """
+
+    def __init__(self, root=LOG_DIR, max_bytes=SEGMENT_MAX_BYTES, max_age=SEGMENT_MAX_AGE, compress=COMPRESS_SEALED):
+        self.root = Path(root)
+        self.offset_dir = self.root / "offsets"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.offset_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- segments -------------------------------------------------------
+
+    def segments(self):
+        """Sorted list of (seq, created_epoch, path)."""
+        found = []
+        for path in self.root.glob("*.jsonl*"):
+            if not path.name.endswith((".jsonl", ".jsonl.gz")):
+                continue
+            seq, created = path.name.split(".", 1)[0].split("-")
+            found.append((int(seq), int(created), path))
+        return sorted(found)
+
+    def _segment_path(self, seq):
+        for candidate in (f"{seq:010d}-*.jsonl", f"{seq:010d}-*.jsonl.gz"):
+            matches = list(self.root.glob(candidate))
+            if matches:
+                return matches[0]
+        return None
+
+    def _seal(self, path):
+        if not self.compress or path.suffix == ".gz":
+            return
+        tmp = path.with_name(path.name + ".gz.tmp")
+        with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, path.with_name(path.name + ".gz"))
+        path.unlink()
+
+    def _active_segment(self):
+        segments = self.segments()
+        now = int(time.time())
+        if segments:
+            seq, created, path = segments[-1]
+            if path.suffix != ".gz" and path.stat().st_size < self.max_bytes and now - created < self.max_age:
+                return path
+            self._seal(path)
+            next_seq = seq + 1
+        else:
+            next_seq = 0
+        return self.root / f"{next_seq:010d}-{now}.jsonl"
+
+    # --- producer -------------------------------------------------------
+
+    def append(self, record):
+        """Append one record as a compact JSON line and return the segment it went to."""
+        path = self._active_segment()
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with open(path, "ab") as f:
+            f.write(line.encode())
+        return path
+
+    # --- consumer -------------------------------------------------------
+
+    def read_from(self, position=(0, 0)):
+        """Yield (record, next_position) for every complete record after `position`."""
+        seq, offset = position
+        for seg_seq, _, path in self.segments():
+            if seg_seq < seq:
+                continue
+            start = offset if seg_seq == seq else 0
+            if not path.exists():
+                # Sealed and compressed since we listed the directory
+                path = self._segment_path(seg_seq)
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rb") as f:
+                f.seek(start)
+                pos = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written record; pick it up next time
+                    pos += len(line)
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"⚠️ Skipping corrupt record in {path.name} @ {pos - len(line)}")
+                        continue
+                    yield record, (seg_seq, pos)
+
+    def load_offset(self, consumer):
+        path = self.offset_dir / f"{consumer}.json"
+        if not path.exists():
+            first = self.segments()
+            return (first[0][0], 0) if first else (0, 0)
+        with open(path) as f:
+            saved = json.load(f)
+        return saved["segment"], saved["position"]
+
+    def commit_offset(self, consumer, position):
+        path = self.offset_dir / f"{consumer}.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"segment": position[0], "position": position[1]}, f)
+        os.replace(tmp, path)
+
+    # --- retention ------------------------------------------------------
+
+    def drop_segments_before(self, cutoff_epoch, consumers=("neo4j",)):
+        """Delete whole sealed segments whose records all predate cutoff and every consumer has passed."""
+        min_consumed = min(self.load_offset(c)[0] for c in consumers)
+        segments = self.segments()
+        dropped = []
+        # A segment's newest record is older than the creation time of the segment after it
+        for (seq, _, path), (_, next_created, _) in zip(segments, segments[1:]):
+            if next_created < cutoff_epoch and seq < min_consumed:
+                path.unlink()
+                dropped.append(path.name)
+        return dropped
+
+
+def import_raw_files(raw_dir=Path("data/raw"), log_file=Path("data/pushed_files.txt")):
+    """One-off migration: append raw JSON files that were never pushed to the segment log."""
+    pushed = set()
+    if log_file.exists():
+        with open(log_file) as f:
+            pushed = set(line.strip() for line in f)
+
+    log = SegmentLog()
+    count = 0
+    for file in sorted(raw_dir.glob("*.json")):
+        if file.name in pushed:
+            continue
+        with open(file) as f:
+            log.append(json.load(f))
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or migrate the tick segment log")
+    parser.add_argument("--import-raw", action="store_true", help="Append unpushed data/raw/*.json files to the log")
+    args = parser.parse_args()
+
+    if args.import_raw:
+        print(f"✅ Imported {import_raw_files()} raw file(s) into {LOG_DIR}")
+
+    log = SegmentLog()
+    for seq, created, path in log.segments():
+        print(f"📦 {path.name}  {path.stat().st_size} bytes  created {time.strftime('%Y-%m-%d %H:%M', time.localtime(created))}")
+    for offset_file in sorted(log.offset_dir.glob("*.json")):
+        print(f"📍 {offset_file.stem}: {log.load_offset(offset_file.stem)}")
@@ -6,6 +6,8 @@ import random
 import hashlib
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
+from utils.queries import run_query
+from ingest.write_path import WritePath, TRANSIENT_ERRORS, WRITTEN
 
 # Load environment variables
 load_dotenv()
@@ -17,47 +19,43 @@ PASSWORD = os.getenv("NEO4J_PASSWORD")
 WALLET_COUNT = 50
 WALLET_POOL = [f"wallet_{i:03d}" for i in range(WALLET_COUNT)]
 
+# Transactions linked per write (one UNWIND statement instead of one transaction per tick)
+BATCH_SIZE = 500
+
 # Connect to Neo4j
 driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
 
 def generate_tx_id(timestamp):
     return hashlib.sha256(timestamp.encode()).hexdigest()[:16]
 
-def simulate_wallet_links():
-    with driver.session() as session:
-        txns = session.run("""
-            MATCH (t:Transaction)
-            WHERE t.simulated IS NULL
-            RETURN t.timestamp AS ts
-            ORDER BY ts
-        """)
-        count = 0
-        for record in txns:
-            timestamp = record["ts"]
-            tx_id = generate_tx_id(str(timestamp))
-            sender = random.choice(WALLET_POOL)
-            receivers = random.sample([w for w in WALLET_POOL if w != sender], random.choice([1, 2]))
-            session.execute_write(link_wallets, timestamp, tx_id, sender, receivers)
-            count += 1
-
-        print(f"✅ Simulated wallets for {count} new transaction(s)")
-
-def link_wallets(tx, timestamp, tx_id, sender, receivers):
-    # Link sender to transaction
-    tx.run("""
-        MERGE (s:Wallet {address: $sender})
-        MERGE (t:Transaction {tx_id: $tx_id})
-        SET t.timestamp = $timestamp, t.simulated = true
-        MERGE (s)-[:SENT]->(t)
-    """, timestamp=timestamp, tx_id=tx_id, sender=sender)
-
-    # Link receivers to transaction
-    for r in receivers:
-        tx.run("""
-            MERGE (r:Wallet {address: $receiver})
-            MERGE (t:Transaction {tx_id: $tx_id})
-            MERGE (t)-[:RECEIVED_BY]->(r)
-        """, tx_id=tx_id, receiver=r)
+def simulate_wallet_links(batch_size=BATCH_SIZE):
+    try:
+        with driver.session() as session:
+            txns = run_query(session, "unsimulated_ticks")
+    except TRANSIENT_ERRORS as e:
+        print(f"⚠️ Neo4j unavailable, skipping wallet simulation this cycle: {e}")
+        return
+
+    rows = []
+    for record in txns:
+        timestamp = record["ts"]
+        sender = random.choice(WALLET_POOL)
+        rows.append({
+            "timestamp": timestamp,
+            "tx_id": generate_tx_id(str(timestamp)),
+            "sender": sender,
+            "receivers": random.sample([w for w in WALLET_POOL if w != sender], random.choice([1, 2])),
+        })
+
+    write_path = WritePath(driver)
+    deferred = 0
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        if write_path.write([("link_wallets", chunk)], ("transactions", "wallets")) != WRITTEN:
+            deferred += len(chunk)
+
+    print(f"✅ Simulated wallets for {len(rows)} new transaction(s)"
+          + (f", {deferred} spilled or dead-lettered" if deferred else ""))
 
 if __name__ == "__main__":
     simulate_wallet_links()
@@ -0,0 +1,231 @@
+# File: ingest/stream_ingest.py
+# Description: Consumes a line-delimited tick feed and flushes it to Neo4j in micro-batches with backpressure and latency reporting
+
+import argparse
+import datetime
+import json
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from ingest.push_to_neo4j import driver, tick_statements, ensure_schema
+from ingest.write_path import WritePath, TRANSIENT_ERRORS, WRITTEN, SPILLED
+from ingest.anomaly import AnomalyDetector, format_alert
+
+DEFAULT_FEED = "tcp://localhost:9100"
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+REPORT_INTERVAL = 30
+RECONNECT_DELAY = 2
+
+shutdown_flag = threading.Event()
+
+
+def normalize_tick(raw):
+    """Map a feed message onto the Transaction properties written by the file pipeline."""
+    return {
+        "timestamp": raw.get("timestamp") or datetime.datetime.now().isoformat(),
+        "price_usd": raw.get("price_usd"),
+        "market_cap": raw.get("market_cap"),
+        "volume_24h": raw.get("volume_24h"),
+    }
+
+
+def read_lines(feed):
+    """Yield raw lines from a tcp://, ws:// / wss:// or stdin ("-") feed."""
+    if feed == "-":
+        yield from sys.stdin
+        return
+
+    parsed = urlparse(feed)
+    if parsed.scheme == "tcp":
+        with socket.create_connection((parsed.hostname, parsed.port)) as sock:
+            yield from sock.makefile("r", encoding="utf-8")
+    elif parsed.scheme in ("ws", "wss"):
+        try:
+            from websockets.sync.client import connect
+        except ImportError:
+            raise RuntimeError("websocket feeds need the `websockets` package (pip install websockets)")
+        with connect(feed) as ws:
+            for message in ws:
+                yield from str(message).splitlines()
+    else:
+        raise ValueError(f"Unsupported feed: {feed}")
+
+
+class LatencyStats:
+    """Rolling ingest-to-visible latency samples (seconds) with percentile reporting."""
+
+    def __init__(self, window=5000):
+        self.samples = deque(maxlen=window)
+        self.total = 0
+        self.batches = 0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self.spilled = 0
+        self.dead_lettered = 0
+        self.failed_batches = 0
+
+    def record_batch(self, received_at, committed_at):
+        self.samples.extend(committed_at - t for t in received_at)
+        self.total += len(received_at)
+        self.batches += 1
+
+    def report(self):
+        # Ticks that missed Neo4j are reported even before the first successful batch
+        deferred = (f"spilled {self.spilled} | dead-lettered {self.dead_lettered} | "
+                    f"failed batches {self.failed_batches}")
+        if not self.samples:
+            return f"no ticks ingested yet | {deferred}"
+        ordered = sorted(self.samples)
+
+        def pct(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+        return (f"{self.total} ticks in {self.batches} batches | latency ms "
+                f"p50={pct(0.50):.1f} p95={pct(0.95):.1f} p99={pct(0.99):.1f} max={ordered[-1] * 1000:.1f} | "
+                f"max queue depth={self.max_queue_depth} | producer blocked {self.blocked_seconds:.1f}s | {deferred}")
+
+
+def produce(feed, ticks, stats):
+    """Read the feed into the bounded queue; a full queue blocks the reader (backpressure)."""
+    while not shutdown_flag.is_set():
+        try:
+            for line in read_lines(feed):
+                if shutdown_flag.is_set():
+                    return
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    tick = normalize_tick(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"⚠️ Skipping malformed message: {line[:80]}")
+                    continue
+
+                item = (tick, time.monotonic())
+                try:
+                    ticks.put_nowait(item)
+                except queue.Full:
+                    blocked = time.monotonic()
+                    while not shutdown_flag.is_set():
+                        try:
+                            ticks.put(item, timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    stats.blocked_seconds += time.monotonic() - blocked
+                stats.max_queue_depth = max(stats.max_queue_depth, ticks.qsize())
+
+            if feed == "-":
+                shutdown_flag.set()
+                return
+            print("🔌 Feed closed — reconnecting...")
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"❌ Feed error: {e}")
+            if isinstance(e, (RuntimeError, ValueError)):
+                shutdown_flag.set()
+                return
+        time.sleep(RECONNECT_DELAY)
+
+
+def next_batch(ticks, batch_size, flush_interval):
+    """Collect up to batch_size ticks, or whatever arrived within flush_interval of the first one."""
+    try:
+        batch = [ticks.get(timeout=flush_interval)]
+    except queue.Empty:
+        return []
+
+    deadline = time.monotonic() + flush_interval
+    while len(batch) < batch_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(ticks.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def consume(ticks, stats, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, report_interval=REPORT_INTERVAL):
+    last_report = time.monotonic()
+    detector = AnomalyDetector()
+    write_path = WritePath(driver)
+    try:
+        with driver.session() as session:
+            ensure_schema(session)
+    except TRANSIENT_ERRORS as e:
+        print(f"⚠️ Could not ensure schema, Neo4j unavailable: {e}")
+
+    pending = None
+    while pending or not (shutdown_flag.is_set() and ticks.empty()):
+        batch = pending or next_batch(ticks, batch_size, flush_interval)
+        if batch:
+            rows = [tick for tick, _ in batch]
+            before = detector.snapshot()
+            alerts = detector.process(rows)
+            try:
+                # Retries back off (throttling the reader via the queue); an open breaker spills immediately.
+                # Rejected batches are dead-lettered by the write path, so every outcome is durable.
+                outcome = write_path.write(*tick_statements(rows, alerts))
+            except Exception as e:
+                # Not even the local spill queue took it: keep the batch and the detector state it was scored from
+                detector.restore(before)
+                stats.failed_batches += 1
+                print(f"❌ Could not store {len(rows)} tick(s) in Neo4j or the spill queue: {e}")
+                if shutdown_flag.is_set():
+                    print(f"⚠️ Dropping {len(rows) + ticks.qsize()} buffered tick(s) on shutdown")
+                    break
+                pending = batch
+                time.sleep(RECONNECT_DELAY)
+            else:
+                pending = None
+                if outcome == WRITTEN:
+                    stats.record_batch([received for _, received in batch], time.monotonic())
+                elif outcome == SPILLED:
+                    stats.spilled += len(rows)
+                else:
+                    stats.dead_lettered += len(rows)
+                detector.save()
+                for alert in alerts:
+                    print(format_alert(alert))
+
+        if time.monotonic() - last_report >= report_interval:
+            print(f"📈 {stats.report()}")
+            last_report = time.monotonic()
+
+
+def signal_handler(sig, frame):
+    print("\n🛑 Stopping stream ingest — flushing buffered ticks...")
+    shutdown_flag.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream ticks from a push feed into Neo4j")
+    parser.add_argument("--feed", default=DEFAULT_FEED, help="tcp://host:port, ws(s)://... or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL, help="Max seconds a tick waits in the buffer")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--report-interval", type=float, default=REPORT_INTERVAL)
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    ticks = queue.Queue(maxsize=args.queue_size)
+    stats = LatencyStats()
+
+    print(f"📡 Streaming ticks from {args.feed}...")
+    reader = threading.Thread(target=produce, args=(args.feed, ticks, stats), daemon=True)
+    reader.start()
+
+    consume(ticks, stats, args.batch_size, args.flush_interval, args.report_interval)
+    print(f"✅ {stats.report()}")
+    driver.close()
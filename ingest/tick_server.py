@@ -0,0 +1,81 @@
+# File: ingest/tick_server.py
+# Description: Local stand-in push feed that broadcasts Bitcoin ticks as line-delimited JSON over TCP
+
+import argparse
+import datetime
+import json
+import random
+import socket
+import threading
+import time
+
+from ingest.fetch_transactions import fetch_bitcoin_data
+
+clients = []
+clients_lock = threading.Lock()
+
+
+def synthetic_ticks(rate, start_price=60_000.0):
+    """Random-walk ticks at `rate` messages per second, shaped like fetch_bitcoin_data() output."""
+    price = start_price
+    volume = 30e9
+    while True:
+        price *= 1 + random.gauss(0, 0.0005)
+        volume = max(1e9, volume * (1 + random.gauss(0, 0.002)))
+        yield {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "price_usd": round(price, 2),
+            "market_cap": round(price * 19.7e6, 2),
+            "volume_24h": round(volume, 2),
+        }
+        time.sleep(1.0 / rate)
+
+
+def coingecko_ticks(interval):
+    """Poll CoinGecko and re-publish each snapshot as a tick."""
+    while True:
+        data = fetch_bitcoin_data()
+        if data:
+            yield data
+        time.sleep(interval)
+
+
+def broadcast(tick):
+    line = (json.dumps(tick) + "\n").encode()
+    with clients_lock:
+        for conn in list(clients):
+            try:
+                # sendall blocks while a slow consumer's socket buffer is full, which is the backpressure path
+                conn.sendall(line)
+            except OSError:
+                clients.remove(conn)
+                conn.close()
+
+
+def accept_clients(server):
+    while True:
+        conn, addr = server.accept()
+        print(f"🔌 Client connected: {addr[0]}:{addr[1]}")
+        with clients_lock:
+            clients.append(conn)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a line-delimited tick feed for stream_ingest.py")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--synthetic", action="store_true", help="Emit random-walk ticks instead of polling CoinGecko")
+    parser.add_argument("--rate", type=float, default=1.0, help="Synthetic ticks per second")
+    parser.add_argument("--interval", type=float, default=60, help="CoinGecko poll interval in seconds")
+    args = parser.parse_args()
+
+    server = socket.create_server((args.host, args.port), reuse_port=False)
+    threading.Thread(target=accept_clients, args=(server,), daemon=True).start()
+    print(f"📡 Serving ticks on tcp://{args.host}:{args.port}")
+
+    source = synthetic_ticks(args.rate) if args.synthetic else coingecko_ticks(args.interval)
+    try:
+        for tick in source:
+            broadcast(tick)
+    except KeyboardInterrupt:
+        print("\n🛑 Tick server stopped")
@@ -0,0 +1,443 @@
+# File: ingest/write_path.py
+# Description: Resilient Neo4j writes: bounded retries with backoff, a circuit breaker, a durable SQLite spill queue and batched replay
+
+import os
+import json
+import time
+import random
+import sqlite3
+import argparse
+import datetime
+from pathlib import Path
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError, ClientError, AuthError, Forbidden
+from utils.queries import run_query
+from utils.data_version import bump_data_version
+from utils.atomic import write_text_atomic
+
+STATE_DIR = Path("data/state")
+SPILL_FILE = STATE_DIR / "write_spill.sqlite"
+DRILL_LOG = Path("data/metrics/recovery_drills.jsonl")
+
+# Retries per write before it is spilled; delays grow 0.5s, 1s, 2s... (with jitter), capped
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+# Consecutive failed writes that open the breaker, and how long it stays open before a probe
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30
+
+# Rows per replay transaction when draining the spill queue
+REPLAY_BATCH_ROWS = 10_000
+
+# A claimed chunk whose replayer died is handed out again after this long
+CLAIM_TIMEOUT = 300
+
+# Errors that mean "database unavailable or busy, try again later"
+TRANSIENT_ERRORS = (ServiceUnavailable, SessionExpired, TransientError, OSError)
+
+# Outcomes of WritePath.write(); all three mean the unit is stored durably somewhere
+WRITTEN, SPILLED, DEAD_LETTERED = "written", "spilled", "dead_lettered"
+
+
+def is_auth_failure(error):
+    """Credentials or permissions (e.g. after a password rotation): nothing is wrong with the data, so spill it."""
+    code = getattr(error, "code", None) or ""
+    return isinstance(error, (AuthError, Forbidden)) or (
+        isinstance(error, ClientError) and code.startswith("Neo.ClientError.Security."))
+
+
+def is_rejection(error):
+    """Neo4j refused this particular write (bad Cypher or row); the only errors that are dead-lettered."""
+    return isinstance(error, ClientError) and not is_auth_failure(error)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after FAILURE_THRESHOLD consecutive failures; open -> half-open after RESET_TIMEOUT.
+
+    State lives in a small JSON file so the short-lived pipeline processes (push, simulate,
+    stream) share it: once one of them sees Neo4j down, the others stop hammering it too.
+    """
+
+    def __init__(self, name="neo4j", failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.path = STATE_DIR / f"circuit_{name}.json"
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {"state": "closed", "failures": 0, "opened_at": 0.0}
+
+    def _save(self, state):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(self.path, json.dumps(state))
+
+    @property
+    def state(self):
+        state = self._load()
+        if state["state"] == "open" and time.time() - state["opened_at"] >= self.reset_timeout:
+            return "half_open"
+        return state["state"]
+
+    def allow(self):
+        return self.state != "open"
+
+    def record_success(self):
+        state = self._load()
+        if state["state"] != "closed" or state["failures"]:
+            self._save({"state": "closed", "failures": 0, "opened_at": 0.0})
+
+    def record_failure(self):
+        state = self._load()
+        half_open = self.state == "half_open"
+        state["failures"] += 1
+        if half_open or state["failures"] >= self.failure_threshold:
+            if state["state"] != "open" or half_open:
+                print(f"🔌 Circuit opened after {state['failures']} failed write(s); spilling for {self.reset_timeout}s")
+            state.update(state="open", opened_at=time.time())
+        self._save(state)
+
+
+class SpillQueue:
+    """Durable FIFO of write units (statements + watermark scopes) in a local SQLite file, plus a dead-letter table."""
+
+    def __init__(self, path=SPILL_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: autocommit, with explicit short BEGIN IMMEDIATE blocks where several statements must be atomic
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS spill (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at REAL NOT NULL,
+                row_count INTEGER NOT NULL,
+                unit TEXT NOT NULL,
+                claimed_at REAL
+            )
+        """)
+        if "claimed_at" not in [c[1] for c in self.conn.execute("PRAGMA table_info(spill)")]:
+            self.conn.execute("ALTER TABLE spill ADD COLUMN claimed_at REAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS dead_letter (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                failed_at REAL NOT NULL,
+                row_count INTEGER NOT NULL,
+                error TEXT NOT NULL,
+                unit TEXT NOT NULL
+            )
+        """)
+
+    def push(self, statements, scopes):
+        rows = sum(len(s[1]) for s in statements)
+        self.conn.execute("INSERT INTO spill (created_at, row_count, unit) VALUES (?, ?, ?)",
+                          (time.time(), rows, json.dumps({"statements": statements, "scopes": list(scopes)}, default=str)))
+
+    def dead_letter(self, unit, error, spill_id=None):
+        """Park a unit Neo4j rejected (kept for inspection and `--requeue-dead`, never replayed automatically)."""
+        rows = sum(len(s[1]) for s in unit["statements"])
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.execute("INSERT INTO dead_letter (failed_at, row_count, error, unit) VALUES (?, ?, ?, ?)",
+                          (time.time(), rows, f"{type(error).__name__}: {error}", json.dumps(unit, default=str)))
+        if spill_id is not None:
+            self.conn.execute("DELETE FROM spill WHERE id = ?", (spill_id,))
+        self.conn.execute("COMMIT")
+
+    def dead_size(self):
+        """(units, rows) in the dead-letter table."""
+        return self.conn.execute("SELECT count(*), coalesce(sum(row_count), 0) FROM dead_letter").fetchone()
+
+    def requeue_dead(self):
+        """Move every dead-lettered unit back to the end of the spill queue (e.g. after fixing a query)."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        moved = self.conn.execute("""
+            INSERT INTO spill (created_at, row_count, unit) SELECT failed_at, row_count, unit FROM dead_letter ORDER BY id
+        """).rowcount
+        self.conn.execute("DELETE FROM dead_letter")
+        self.conn.execute("COMMIT")
+        return moved
+
+    def size(self):
+        """(units, rows) waiting to be replayed."""
+        units, rows = self.conn.execute("SELECT count(*), coalesce(sum(row_count), 0) FROM spill").fetchone()
+        return units, rows
+
+    def oldest(self):
+        """Creation time of the oldest spilled unit, or None when empty."""
+        return self.conn.execute("SELECT min(created_at) FROM spill").fetchone()[0]
+
+    def claim(self, max_rows):
+        """
+        Claim the oldest unclaimed units, up to about max_rows rows (at least one), as [(id, unit)].
+
+        The write lock is only held while marking them, never while Neo4j is called, so other
+        processes can keep spilling; claimed units are invisible to other replayers until they
+        are deleted, released, or their claim goes stale.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            taken, rows = [], 0
+            for unit_id, row_count, unit in self.conn.execute(
+                    "SELECT id, row_count, unit FROM spill WHERE claimed_at IS NULL OR claimed_at < ? ORDER BY id",
+                    (now - CLAIM_TIMEOUT,)):
+                if taken and rows + row_count > max_rows:
+                    break
+                taken.append((unit_id, json.loads(unit)))
+                rows += row_count
+            self.conn.executemany("UPDATE spill SET claimed_at = ? WHERE id = ?", [(now, i) for i, _ in taken])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return taken
+
+    def release(self, ids):
+        self.conn.executemany("UPDATE spill SET claimed_at = NULL WHERE id = ?", [(i,) for i in ids])
+
+    def delete(self, ids):
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany("DELETE FROM spill WHERE id = ?", [(i,) for i in ids])
+        self.conn.execute("COMMIT")
+
+
+def merge_units(units):
+    """
+    Combine spilled units into one statement per registry query, in first-seen order.
+
+    All batched writes bind their data to $rows (UNWIND), so rows of the same query
+    concatenate into one large statement; other parameters are taken from the latest unit.
+    """
+    merged, scopes = {}, set()
+    for unit in units:
+        scopes.update(unit["scopes"])
+        for name, rows, *extra in unit["statements"]:
+            entry = merged.setdefault(name, {"rows": [], "extra": {}})
+            entry["rows"].extend(rows)
+            entry["extra"].update(extra[0] if extra else {})
+    return [(name, e["rows"], e["extra"]) for name, e in merged.items()], sorted(scopes)
+
+
+def apply_statements(tx, statements, scopes):
+    for name, rows, *extra in statements:
+        if rows:
+            run_query(tx, name, rows=rows, **(extra[0] if extra else {}))
+    if scopes:
+        bump_data_version(tx, *scopes)
+
+
+class WritePath:
+    """
+    Front door for ingest writes.
+
+    write() runs a unit of statements in one explicit transaction with bounded,
+    jittered exponential backoff. If Neo4j stays unavailable, or the breaker is open,
+    the unit goes to the spill queue instead; the same happens on authentication or
+    permission errors. If Neo4j rejects the data or query itself, the unit goes to the
+    dead-letter table. The data is durable in all three cases, so callers can advance
+    their own offsets; any other error is raised. Once writes succeed again, the queue drains first, in
+    large transactions grouped by query.
+    """
+
+    def __init__(self, driver, name="neo4j", spill_file=SPILL_FILE, attempts=RETRY_ATTEMPTS,
+                 failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, replay_rows=REPLAY_BATCH_ROWS):
+        self.driver = driver
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self.spill = SpillQueue(spill_file)
+        self.attempts = attempts
+        self.replay_rows = replay_rows
+
+    def _run(self, statements, scopes):
+        # Explicit transaction: execute_write would retry on its own for up to 30s and hide outages from the breaker
+        with self.driver.session() as session:
+            with session.begin_transaction() as tx:
+                apply_statements(tx, statements, scopes)
+                tx.commit()
+
+    def _run_with_retries(self, statements, scopes):
+        attempts = 1 if self.breaker.state == "half_open" else self.attempts
+        for attempt in range(attempts):
+            try:
+                self._run(statements, scopes)
+                self.breaker.record_success()
+                return True
+            except Exception as e:
+                if not isinstance(e, TRANSIENT_ERRORS) and not is_auth_failure(e):
+                    raise
+                # Retrying cannot fix credentials: spill straight away and let the breaker open
+                if attempt + 1 == attempts or is_auth_failure(e):
+                    print(f"⚠️ Write failed after {attempt + 1} attempt(s): {e}")
+                    break
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+                time.sleep(random.uniform(delay / 2, delay))
+        self.breaker.record_failure()
+        return False
+
+    def _attempt(self, statements, scopes):
+        """
+        True (committed), False (Neo4j unavailable or refusing our credentials) or the error Neo4j
+        rejected the write with. Anything else (a bug on our side) is raised, so callers do not
+        advance their offsets past data that was never stored.
+        """
+        try:
+            return self._run_with_retries(statements, scopes)
+        except Exception as e:
+            if is_rejection(e):
+                return e
+            raise
+
+    def write(self, statements, scopes=()):
+        """Write [(query_name, rows[, extra_params])] atomically; returns WRITTEN, SPILLED or DEAD_LETTERED."""
+        if self.breaker.allow() and self.replay():
+            result = self._attempt(statements, scopes)
+            if result is True:
+                return WRITTEN
+            if result is not False:
+                self.spill.dead_letter({"statements": statements, "scopes": list(scopes)}, result)
+                print(f"☠️ Neo4j rejected a write of {sum(len(s[1]) for s in statements)} row(s), dead-lettered: {result}")
+                return DEAD_LETTERED
+        self.spill.push(statements, scopes)
+        return SPILLED
+
+    def _replay_one_by_one(self, taken, done):
+        """Replay units individually, dead-lettering rejected ones into `done`; returns False if Neo4j went away."""
+        for unit_id, unit in taken:
+            result = self._attempt(unit["statements"], unit["scopes"])
+            if result is False:
+                return False
+            if result is not True:
+                self.spill.dead_letter(unit, result, spill_id=unit_id)
+                print(f"☠️ Dead-lettered spilled write {unit_id}: {result}")
+            done.append(unit_id)
+        return True
+
+    def replay(self):
+        """Drain the spill queue; returns True when nothing is left to replay (chunks other processes hold aside)."""
+        while self.spill.size()[0]:
+            if not self.breaker.allow():
+                return False
+            taken = self.spill.claim(self.replay_rows)
+            if not taken:
+                return True
+            started = time.perf_counter()
+            done = []
+            try:
+                result = self._attempt(*merge_units([unit for _, unit in taken]))
+                if result is True:
+                    done, available = [unit_id for unit_id, _ in taken], True
+                elif result is False:
+                    available = False
+                else:
+                    # One bad unit must not block the queue: isolate it by replaying the batch unit by unit
+                    print(f"⚠️ Merged replay rejected ({result}); replaying {len(taken)} write(s) one by one")
+                    available = self._replay_one_by_one(taken, done)
+            finally:
+                # Delete what Neo4j committed, and hand anything else back to the queue
+                finished = set(done)
+                self.spill.delete(done)
+                self.spill.release([unit_id for unit_id, _ in taken if unit_id not in finished])
+            if done:
+                rows = sum(len(s[1]) for unit_id, unit in taken if unit_id in finished for s in unit["statements"])
+                print(f"♻️ Replayed {len(done)} spilled write(s) ({rows} rows) in {time.perf_counter() - started:.2f}s")
+            if not available:
+                return False
+        return True
+
+    def status(self):
+        units, rows = self.spill.size()
+        dead_units, dead_rows = self.spill.dead_size()
+        oldest = self.spill.oldest()
+        return {"breaker": self.breaker.state, "spilled_units": units, "spilled_rows": rows,
+                "oldest_age_s": round(time.time() - oldest, 1) if oldest else None,
+                "dead_letter_units": dead_units, "dead_letter_rows": dead_rows}
+
+
+def run_drill(driver, interval=1.0, duration=600, reset_timeout=5):
+    """
+    Measure recovery: write a probe every `interval` seconds while you stop and restart Neo4j.
+
+    Reports when writes started failing, when Neo4j accepted writes again and when the
+    spilled backlog was fully replayed. Uses its own spill file and breaker, and deletes
+    its probe nodes afterwards.
+    """
+    path = WritePath(driver, name="drill", spill_file=STATE_DIR / "drill_spill.sqlite", attempts=1,
+                     failure_threshold=1, reset_timeout=reset_timeout)
+    print(f"🧪 Writing a probe every {interval}s for up to {duration}s — stop and restart Neo4j now")
+    started = time.time()
+    outage_at = back_at = drained_at = None
+    peak_rows = seq = 0
+
+    while time.time() - started < duration:
+        seq += 1
+        now = time.time()
+        written = path.write([("drill_probe", [{"seq": seq, "at": datetime.datetime.now().isoformat()}])]) == WRITTEN
+        backlog = path.spill.size()[1]
+        peak_rows = max(peak_rows, backlog)
+
+        if not written and outage_at is None:
+            outage_at = now
+            print(f"🔴 Write failed at +{now - started:.1f}s — spilling")
+        elif written and outage_at is not None and back_at is None:
+            # write() drains the backlog before the probe, so replay time counts from this iteration's start
+            back_at = now
+            print(f"🟢 Neo4j accepting writes again at +{now - started:.1f}s")
+        if written and back_at is not None and backlog == 0:
+            drained_at = time.time()
+            break
+        time.sleep(max(0.0, interval - (time.time() - now)))
+
+    if outage_at is None or drained_at is None:
+        print("⚠️ Drill ended without a complete outage and recovery")
+        result = None
+    else:
+        result = {
+            "at": datetime.datetime.now().isoformat(),
+            "outage_s": round(back_at - outage_at, 2),
+            "replay_s": round(drained_at - back_at, 2),
+            "recovery_s": round(drained_at - outage_at, 2),
+            "spilled_rows": peak_rows,
+            "probes": seq,
+        }
+        print(f"✅ Outage {result['outage_s']}s, backlog of {peak_rows} write(s) replayed in {result['replay_s']}s, "
+              f"recovered {result['recovery_s']}s after the first failure")
+        DRILL_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(DRILL_LOG, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+    try:
+        with driver.session() as session:
+            run_query(session, "delete_drill_probes")
+    except TRANSIENT_ERRORS as e:
+        print(f"⚠️ Could not remove probe nodes: {e}")
+    return result
+
+
+if __name__ == "__main__":
+    from neo4j import GraphDatabase
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Inspect or drain the write spill queue, or run a recovery drill")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--replay", action="store_true", help="Replay spilled writes now")
+    group.add_argument("--requeue-dead", action="store_true", help="Move dead-lettered writes back to the spill queue")
+    group.add_argument("--drill", action="store_true", help="Measure recovery while Neo4j is stopped and restarted")
+    parser.add_argument("--interval", type=float, default=1.0, help="Drill: seconds between probe writes")
+    parser.add_argument("--duration", type=float, default=600, help="Drill: give up after this many seconds")
+    args = parser.parse_args()
+
+    load_dotenv()
+    driver = GraphDatabase.driver(os.getenv("NEO4J_URI"), auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")))
+
+    if args.drill:
+        run_drill(driver, args.interval, args.duration)
+    else:
+        write_path = WritePath(driver)
+        if args.requeue_dead:
+            print(f"📥 Requeued {write_path.spill.requeue_dead()} dead-lettered write(s)")
+        if args.replay or args.requeue_dead:
+            print("✅ Spill queue empty" if write_path.replay() else "⚠️ Neo4j still unavailable; spilled writes kept")
+        print(f"📊 {write_path.status()}")
+    driver.close()
@@ -12,26 +12,12 @@ for arg in "$@"; do
   fi
 done
 
-# Optional: Regenerate assets
+# Optional: Regenerate assets from one snapshot, in parallel (writes are atomic, so no settle delay is needed)
 if [ "$REGEN" = true ]; then
   echo "🔁 Regenerating price chart, summary, and graph..."
-
-  echo "📉 Generating Bitcoin price chart..."
-  python analysis/price_chart.py
-
-  echo "🧠 Generating NLP summary..."
-  python analysis/langchain_summary.py
-
-  echo "🔗 Generating wallet graph..."
-  python analysis/graph_pyvis.py
-
-  echo "✅ Preprocessing complete."
+  python -m analysis.regenerate || echo "⚠️ Some artifacts failed to regenerate; launching with the previous ones."
 fi
 
-# Optional: short delay to ensure data is committed
-echo "⏳ Waiting for data stabilization..."
-sleep 5
-
 # Start the Streamlit app
 echo "🚀 Launching dashboard..."
 streamlit run app.py
@@ -0,0 +1,6 @@
+# File: tests/conftest.py
+# Description: Test setup; modules create their Neo4j driver at import, which only needs a well-formed URI (no server)
+
+import os
+
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
@@ -0,0 +1,47 @@
+# File: tests/test_anomaly.py
+# Description: Alert rates of the incremental anomaly detectors on flat (repeated-poll) feeds
+
+import math
+import random
+from collections import Counter
+from ingest.anomaly import AnomalyDetector
+
+
+def mostly_flat_ticks(zero_fraction, n=5000, jump_at=4000, seed=1):
+    """Random-walk prices where most polls repeat the previous value, with one 3% jump."""
+    rnd = random.Random(seed)
+    price, ticks = 50_000.0, []
+    for i in range(n):
+        if rnd.random() > zero_fraction:
+            price *= math.exp(rnd.gauss(0, 0.0005))
+        if i == jump_at:
+            price *= 1.03
+        ticks.append({"timestamp": f"2024-01-01T{i:06d}", "price_usd": price, "volume_24h": 1e9})
+    return ticks
+
+
+def test_mostly_flat_series_does_not_flood_mad_alerts(tmp_path):
+    for zero_fraction in (0.3, 0.6, 0.9):
+        ticks = mostly_flat_ticks(zero_fraction)
+        alerts = AnomalyDetector(tmp_path / f"state_{zero_fraction}.json").process(ticks)
+        counts = Counter(a["detector"] for a in alerts)
+
+        assert counts["mad"] <= 5, (zero_fraction, counts)
+        assert counts["ewma"] <= 5, (zero_fraction, counts)
+        # The genuine jump is still caught, and the constant volume never alerts
+        assert any(a["timestamp"] == ticks[4000]["timestamp"] and a["metric"] == "price_usd" for a in alerts)
+        assert not any(a["metric"] == "volume_24h" for a in alerts)
+
+
+def test_flat_window_state_round_trips(tmp_path):
+    ticks = mostly_flat_ticks(0.6, n=3000, jump_at=2500)
+    state_file = tmp_path / "state.json"
+
+    fresh = AnomalyDetector(state_file).process(ticks)
+
+    first = AnomalyDetector(state_file)
+    resumed = first.process(ticks[:1500])
+    first.save()
+    resumed += AnomalyDetector(state_file).process(ticks[1000:])
+
+    assert resumed == fresh
@@ -0,0 +1,146 @@
+# File: tests/test_write_path.py
+# Description: Spill, replay and dead-letter behaviour of the write path against a fake Neo4j driver
+
+import pytest
+from neo4j.exceptions import AuthError, ClientError, ServiceUnavailable
+import ingest.write_path as write_path
+from ingest.write_path import SpillQueue, WritePath, WRITTEN, SPILLED, DEAD_LETTERED
+
+
+class FakeTransaction:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def run(self, cypher, params):
+        if self.db.during_write:
+            self.db.during_write()
+        rows = params.get("rows", [])
+        if self.db.reject_bad and any(row.get("bad") for row in rows):
+            raise ClientError("Neo4j rejected the row")
+        self.rows.extend(row["timestamp"] for row in rows)
+        return []
+
+    def commit(self):
+        self.db.committed.extend(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, db):
+        self.db = db
+
+    def begin_transaction(self):
+        if self.db.down:
+            raise ServiceUnavailable("Neo4j is down")
+        if self.db.password_rotated:
+            raise AuthError("The client is unauthorized due to authentication failure.")
+        return FakeTransaction(self.db)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeDriver:
+    def __init__(self):
+        self.down = False
+        self.password_rotated = False
+        self.reject_bad = True
+        self.during_write = None
+        self.committed = []
+
+    def session(self):
+        return FakeSession(self)
+
+
+def ticks(*timestamps, bad=False):
+    return [("upsert_ticks", [{"timestamp": ts, "bad": bad} for ts in timestamps])]
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(write_path, "RETRY_BASE_DELAY", 0.0)
+    return WritePath(FakeDriver(), spill_file=tmp_path / "spill.sqlite", reset_timeout=0)
+
+
+def test_rejected_spilled_unit_is_dead_lettered_and_queue_keeps_draining(path):
+    path.driver.down = True
+    assert path.write(ticks("t1", "t2")) == SPILLED
+    assert path.write(ticks("t3", bad=True)) == SPILLED
+    assert path.write(ticks("t4")) == SPILLED
+    assert path.spill.size() == (3, 4)
+
+    path.driver.down = False
+    assert path.write(ticks("t5")) == WRITTEN
+    assert path.driver.committed == ["t1", "t2", "t4", "t5"]
+    assert path.spill.size() == (0, 0)
+    assert path.spill.dead_size() == (1, 1)
+
+    # Later writes are unaffected by the parked unit
+    assert path.write(ticks("t6")) == WRITTEN
+    assert path.driver.committed[-1] == "t6"
+
+
+def test_rejected_new_write_is_dead_lettered_not_raised(path):
+    assert path.write(ticks("t1", bad=True)) == DEAD_LETTERED
+    assert path.write(ticks("t2")) == WRITTEN
+    assert path.driver.committed == ["t2"]
+    assert path.status()["dead_letter_units"] == 1
+
+
+def test_requeued_dead_letters_are_replayed(path):
+    assert path.write(ticks("t1", bad=True)) == DEAD_LETTERED
+
+    # The cause is fixed (e.g. a corrected query), then the parked unit is requeued
+    path.driver.reject_bad = False
+    assert path.spill.requeue_dead() == 1
+    assert path.spill.size() == (1, 1)
+    assert path.spill.dead_size() == (0, 0)
+
+    assert path.replay()
+    assert path.driver.committed == ["t1"]
+    assert path.spill.size() == (0, 0)
+
+
+def test_auth_failure_is_spilled_not_dead_lettered(path):
+    path.driver.password_rotated = True
+    assert path.write(ticks("t1")) == SPILLED
+    assert path.spill.dead_size() == (0, 0)
+
+    path.driver.password_rotated = False
+    assert path.write(ticks("t2")) == WRITTEN
+    assert path.driver.committed == ["t1", "t2"]
+
+
+def test_bugs_are_raised_not_dead_lettered(path):
+    with pytest.raises(KeyError):
+        path.write([("no_such_query", [{"timestamp": "t1"}])])
+    assert path.spill.dead_size() == (0, 0)
+
+
+def test_replay_does_not_lock_out_other_spillers(path):
+    path.driver.down = True
+    path.write(ticks("t1"))
+    path.driver.down = False
+
+    # Another pipeline process spills while this one is mid-replay (i.e. inside the Neo4j call)
+    other = SpillQueue(path.spill.path)
+    other.conn.execute("PRAGMA busy_timeout = 100")
+
+    def spill_once():
+        path.driver.during_write = None
+        other.push(ticks("t2"), ["transactions"])
+
+    path.driver.during_write = spill_once
+    assert path.replay()
+    assert path.driver.committed == ["t1", "t2"]
+    assert path.spill.size() == (0, 0)
@@ -1,28 +1,87 @@
 # File: ui/tabs/price_chart.py
-# Description: Streamlit tab to display the Bitcoin price and volume chart using a pre-generated image
+# Description: Streamlit tab to display the Bitcoin price, selectable technical indicators and 24h volume
 
 import streamlit as st
 import os
 import pandas as pd
-from ui.utils.autorefresh import auto_refresh
+from ui.utils.autorefresh import auto_refresh, live_panel
+from ui.utils.helpers import get_recent_alerts
+
+INDICATOR_CSV = "btc_price_volume.csv"
+
+# Indicators drawn on the price axis
+OVERLAYS = {
+    "SMA 5": ["sma_5"],
+    "SMA 20": ["sma_20"],
+    "SMA 50": ["sma_50"],
+    "EMA 12": ["ema_12"],
+    "EMA 26": ["ema_26"],
+    "VWAP (daily)": ["vwap"],
+    "Bollinger Bands (20, 2σ)": ["bb_upper", "bb_mid", "bb_lower"],
+}
+
+# Indicators with their own scale, drawn below the price
+OSCILLATORS = {
+    "RSI (14)": "rsi_14",
+    "Realized Volatility (20, % per tick)": "vol_20",
+}
+
+
+def load_indicators():
+    # Indicators are precomputed by analysis.price_chart; picking them below never queries Neo4j
+    if not os.path.exists(INDICATOR_CSV):
+        return None
+    df = pd.read_csv(INDICATOR_CSV, parse_dates=["timestamp"])
+    return df.set_index("timestamp")
+
+
+def draw_chart(df):
+    if df is None or df.empty:
+        st.warning("Price data not found. Run `python -m analysis.price_chart` to generate it.")
+        return
+
+    selected = st.multiselect("Indicators", list(OVERLAYS) + list(OSCILLATORS),
+                              default=["SMA 5"], key="price_chart-indicators")
+    overlay_cols = [c for name in selected if name in OVERLAYS for c in OVERLAYS[name]]
+    st.line_chart(df[["price"] + overlay_cols], y_label="Price (USD)")
+
+    for name in selected:
+        if name in OSCILLATORS:
+            st.caption(name)
+            st.line_chart(df[[OSCILLATORS[name]]], height=160)
+
+    st.caption("24h Volume (USD)")
+    if len(df) >= 12:
+        st.bar_chart(df[["volume"]], height=160)
+    else:
+        st.warning("Volume bars may be inaccurate — need more data for stable 24h rolling volume.")
+
+
+def draw_alerts(df_alerts):
+    if df_alerts.empty:
+        st.info("No anomalies detected yet.")
+        return
+    counts = df_alerts.groupby(["metric", "direction"]).size().rename("alerts").reset_index()
+    st.dataframe(counts, use_container_width=True, hide_index=True)
+    st.dataframe(df_alerts, use_container_width=True, hide_index=True)
 
 
 def render():
-    st.markdown("### Bitcoin Price (5-pt Moving Average) & 24h Volume")
-    auto_refresh(
-        interval=60, 
-        run_script="analysis/price_chart.py", 
-        label="This chart updates every minute using live data.",
+    st.markdown("### Bitcoin Price, Indicators & 24h Volume")
+    enabled = auto_refresh(
+        label="This chart updates every minute when new ticks arrive.",
         key="price_chart"
     )
-    chart_path = "btc_price_volume.png"
-    if os.path.exists(chart_path):
-        st.image(chart_path, caption="Bitcoin Price and 24h Volume (Last 7 Days)", use_container_width=True)
-        try:
-            df = pd.read_csv("btc_price_volume.csv")
-            if len(df) < 12:
-                st.warning("Volume bars may be inaccurate — need more data for stable 24h rolling volume.")
-        except:
-            st.info("Volume accuracy improves with more data collected over time.")
-    else:
-        st.warning("Price chart not found. Run `price_chart.py` to generate it.")
+    live_panel(
+        "price_chart", ("transactions",),
+        load=load_indicators, draw=draw_chart,
+        interval=60, enabled=enabled, run_script="analysis.price_chart"
+    )
+
+    st.markdown("### Recent Anomaly Alerts")
+    st.caption("Raised during ingest by EWMA z-score, rolling median/MAD and CUSUM detectors on price and 24h volume changes. Price alerts are also marked on the saved chart image (`btc_price_volume.png`).")
+    live_panel(
+        "alerts", ("alerts",),
+        load=get_recent_alerts, draw=draw_alerts,
+        interval=60, enabled=enabled
+    )
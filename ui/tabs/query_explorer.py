@@ -1,42 +1,46 @@
 # File: ui/tabs/query_explorer.py
 # Description: Streamlit tab for interactive Cypher query execution and natural language Q&A using LangChain
 
+import json
 import streamlit as st
 import pandas as pd
-from analysis.langchain_qa import run_qa_question, llm
 from ui.utils.helpers import run_custom_query, flatten_value
+from utils.queries import explorer_samples
 
 
 def render():
     st.markdown("### Query Explorer & Q&A")
 
-    mode = st.radio("Choose input mode:", ["Cypher Query", "Natural Language Question"], horizontal=True)
+    mode = st.radio("Choose input mode:", ["Cypher Query", "Natural Language Question", "Trace Fund Flow"], horizontal=True)
 
     if mode == "Cypher Query":
-        sample_queries = {
-            "Show 5 Wallets": "MATCH (w:Wallet) RETURN w LIMIT 5",
-            "Show 5 Transactions": "MATCH (t:Transaction) RETURN t.tx_id, t.timestamp, t.price_usd LIMIT 5",
-            "Transactions by wallet_017": "MATCH (w:Wallet {address: 'wallet_017'})-[:SENT]->(t:Transaction)-[:RECEIVED_BY]->(r:Wallet) RETURN r.address AS receiver, t.tx_id AS tx_id",
-            "Top 5 Receivers": "MATCH (w:Wallet)<-[:RECEIVED_BY]-() RETURN w.address AS wallet, count(*) AS received ORDER BY received DESC LIMIT 5",
-            "Last 24h Transactions": "MATCH (t:Transaction) WHERE datetime(t.timestamp) > datetime() - duration('P1D') RETURN t.tx_id, t.timestamp, t.price_usd",
-            "Transaction Volume Per Day (7 days)": "MATCH (t:Transaction) WHERE datetime(t.timestamp) >= datetime() - duration('P7D') RETURN date(datetime(t.timestamp)) AS day, count(*) AS txn_count ORDER BY day",
-            "Received by wallet_017 in last 24h": "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet {address: 'wallet_017'}) WHERE datetime(t.timestamp) > datetime() - duration('P1D') RETURN t.tx_id, t.timestamp"
-        }
+        # Registered, parameterized samples: changing a value reuses the same cached plan
+        sample_queries = explorer_samples()
 
         query_choice = st.selectbox("Select a sample query:", options=["(choose one)"] + list(sample_queries.keys()))
-        default_query = sample_queries.get(query_choice, "MATCH (n) RETURN n LIMIT 5")
+        default_query, default_params = sample_queries.get(query_choice, ("MATCH (n) RETURN n LIMIT $limit", {"limit": 5}))
 
         query_input = st.text_area("Enter Cypher Query:", default_query, height=150)
+        params_input = st.text_area("Parameters (JSON):", json.dumps(default_params), height=68,
+                                    help="Values for $placeholders in the query, e.g. {\"wallet\": \"wallet_017\"}")
 
         if st.button("Run Query"):
             try:
-                records = run_custom_query(query_input)
+                records = run_custom_query(query_input, json.loads(params_input or "{}"))
                 flat_records = [{k: flatten_value(v) for k, v in row.items()} for row in records]
                 st.dataframe(pd.DataFrame(flat_records))
+            except json.JSONDecodeError as e:
+                st.error(f"⚠️ Parameters are not valid JSON: {e}")
             except Exception as e:
                 st.error(f"⚠️ Error running query: {e}")
 
+    elif mode == "Trace Fund Flow":
+        render_fund_flow()
+
     else:
+        # Deferred: pulls in langchain and ChatOllama, which only this mode needs
+        from analysis.langchain_qa import run_qa_question, llm
+
         st.markdown("#### Ask a Question")
 
         user_q = st.text_input("Enter your question:", placeholder="e.g., Which wallets sent transactions yesterday?")
@@ -72,3 +76,41 @@ def render():
                     st.dataframe(pd.DataFrame(flat_records))
                 except Exception as e:
                     st.error(f"⚠️ Error running query: {e}")
+
+
+def render_fund_flow():
+    from analysis.fund_flow import trace_fund_flow, path_edges
+
+    st.markdown("#### Trace Fund Flow Between Wallets")
+
+    col1, col2 = st.columns(2)
+    source = col1.text_input("From wallet:", value="wallet_017")
+    target = col2.text_input("To wallet:", value="wallet_042")
+
+    col1, col2, col3 = st.columns(3)
+    max_hops = col1.slider("Max hops", min_value=1, max_value=8, value=4)
+    k = col2.number_input("Top-k shortest paths", min_value=1, max_value=50, value=5)
+    causal = col3.checkbox("Time-ordered (causal) only", value=True)
+    highlight = st.checkbox("Highlight paths in the Wallet Graph tab", value=False)
+
+    if st.button("Trace"):
+        try:
+            paths, elapsed_ms = trace_fund_flow(source.strip(), target.strip(), max_hops, int(k), causal)
+        except Exception as e:
+            st.error(f"⚠️ Error tracing fund flow: {e}")
+            return
+
+        st.session_state["traced_paths"] = paths
+        if highlight and paths:
+            st.session_state["highlight_edges"] = path_edges(paths)
+        else:
+            st.session_state.pop("highlight_edges", None)
+
+        if not paths:
+            st.info(f"No path from {source} to {target} within {max_hops} hops ({elapsed_ms:.1f} ms).")
+            return
+
+        st.caption(f"Found {len(paths)} path(s) in {elapsed_ms:.1f} ms")
+        for i, path in enumerate(paths, start=1):
+            st.markdown(f"**Path {i}** ({path['hops']} hops): " + " → ".join(path["wallets"]))
+            st.dataframe(pd.DataFrame(path["transfers"]), use_container_width=True)
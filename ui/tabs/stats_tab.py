@@ -4,71 +4,107 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from ui.utils.helpers import get_node_stats, get_graph_stats, get_24h_transaction_count, get_top_senders, get_top_receivers, get_daily_txn_counts
-from ui.utils.autorefresh import auto_refresh
+from ui.utils.helpers import get_node_stats, get_graph_stats, get_24h_transaction_count, get_top_senders, get_top_receivers, get_daily_txn_counts, get_wallet_centrality, get_component_summary, get_query_stats
+from ui.utils.autorefresh import auto_refresh, live_panel
+
+
+def load_metrics():
+    wallets, txns = get_node_stats()
+    tx24 = get_24h_transaction_count()
+    total_edges, sent_count, received_count = get_graph_stats()
+    return wallets, txns, tx24, total_edges, sent_count, received_count
+
+
+def draw_metrics(metrics):
+    wallets, txns, tx24, total_edges, sent_count, received_count = metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Wallet Nodes", wallets)
+        st.metric("Transaction Nodes", txns)
+    with col2:
+        st.metric("Total Edges", total_edges)
+        st.metric("Tx in Last 24h", tx24)
+    with col3:
+        st.metric("SENT Edges", sent_count)
+        st.metric("RECEIVED_BY Edges", received_count)
+
+
+def draw_top_senders(df_sent):
+    st.dataframe(df_sent, use_container_width=True)
+    chart = alt.Chart(df_sent.sort_values("sent_count", ascending=False)).mark_bar().encode(
+        x=alt.X("wallet:N", sort="-y", title="Wallet"),
+        y=alt.Y("sent_count:Q", title="Sent Txns"),
+        tooltip=["wallet", "sent_count"]
+    ).properties(height=300)
+
+    st.altair_chart(chart, use_container_width=True)
+
+
+def draw_top_receivers(df_recv):
+    st.dataframe(df_recv, use_container_width=True)
+    chart = alt.Chart(df_recv.sort_values("received_count", ascending=False)).mark_bar().encode(
+        x=alt.X("wallet:N", sort="-y", title="Wallet"),
+        y=alt.Y("received_count:Q", title="Received Txns"),
+        tooltip=["wallet", "received_count"]
+    ).properties(height=300)
+
+    st.altair_chart(chart, use_container_width=True)
+
+
+def draw_daily_counts(df_days):
+    if not df_days.empty:
+        df_days = df_days.copy()
+        df_days["day"] = df_days["day"].astype(str)
+        st.line_chart(df_days.set_index("day"))
+    else:
+        st.info("Not enough data for daily transaction chart.")
+
+
+def load_centrality():
+    df_rank = get_wallet_centrality()
+    summary = get_component_summary() if not df_rank.empty else (0, 0)
+    return df_rank, summary
+
+
+def draw_centrality(data):
+    df_rank, (component_count, largest_component) = data
+    if not df_rank.empty:
+        col1, col2 = st.columns(2)
+        col1.metric("Connected Components", component_count)
+        col2.metric("Largest Component (wallets)", largest_component)
+        st.dataframe(df_rank, use_container_width=True)
+    else:
+        st.info("No centrality scores yet. Run `python -m analysis.graph_analytics` to compute them.")
 
 
 def render():
     st.markdown("### Node Statistics and Top Wallets")
-    auto_refresh(
-        interval=60,
-        label="Stats refresh every minute.",
+    enabled = auto_refresh(
+        label="Each panel refreshes within a minute of new data arriving.",
         key="stats"
     )
-    try:
-        wallets, txns = get_node_stats()
-        tx24 = get_24h_transaction_count()
-        total_edges, sent_count, received_count = get_graph_stats()
-
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Wallet Nodes", wallets)
-            st.metric("Transaction Nodes", txns)
-        with col2:
-            st.metric("Total Edges", total_edges)
-            st.metric("Tx in Last 24h", tx24)
-        with col3:
-            st.metric("SENT Edges", sent_count)
-            st.metric("RECEIVED_BY Edges", received_count)
-    except Exception as e:
-        st.error(f"Unable to load metrics: {e}")
+    live_panel("stats_metrics", ("transactions", "wallets"), load_metrics, draw_metrics, enabled=enabled)
 
     st.markdown("#### 🥇 Top 5 Wallets by Sent Transactions")
-    try:
-        df_sent = get_top_senders()
-        st.dataframe(df_sent, use_container_width=True)
-        chart = alt.Chart(df_sent.sort_values("sent_count", ascending=False)).mark_bar().encode(
-            x=alt.X("wallet:N", sort="-y", title="Wallet"),
-            y=alt.Y("sent_count:Q", title="Sent Txns"),
-            tooltip=["wallet", "sent_count"]
-        ).properties(height=300)
-
-        st.altair_chart(chart, use_container_width=True)
-    except Exception as e:
-        st.error(f"Unable to load top senders: {e}")
+    live_panel("top_senders", ("wallets",), get_top_senders, draw_top_senders, enabled=enabled)
 
     st.markdown("#### 🥈 Top 5 Wallets by Received Transactions")
-    try:
-        df_recv = get_top_receivers()
-        st.dataframe(df_recv, use_container_width=True)
-        chart = alt.Chart(df_recv.sort_values("received_count", ascending=False)).mark_bar().encode(
-            x=alt.X("wallet:N", sort="-y", title="Wallet"),
-            y=alt.Y("received_count:Q", title="Received Txns"),
-            tooltip=["wallet", "received_count"]
-        ).properties(height=300)
+    live_panel("top_receivers", ("wallets",), get_top_receivers, draw_top_receivers, enabled=enabled)
 
-        st.altair_chart(chart, use_container_width=True)
+    st.markdown("#### 📅 Daily Transaction Counts (Last 7 Days)")
+    live_panel("daily_txn_counts", ("transactions",), get_daily_txn_counts, draw_daily_counts, enabled=enabled)
 
-    except Exception as e:
-        st.error(f"Unable to load top receivers: {e}")
+    st.markdown("#### 🧭 Wallet Centrality (PageRank)")
+    if st.button("Recompute Graph Analytics"):
+        with st.spinner("Exporting wallet graph and scoring wallets..."):
+            try:
+                from analysis.graph_analytics import run_graph_analytics
+                summary = run_graph_analytics()
+                st.success(f"Scored {summary['wallets']} wallets (graph version {summary['version']})")
+            except Exception as e:
+                st.error(f"Graph analytics failed: {e}")
+    live_panel("wallet_centrality", ("analytics",), load_centrality, draw_centrality, enabled=enabled)
 
-    st.markdown("#### 📅 Daily Transaction Counts (Last 7 Days)")
-    try:
-        df_days = get_daily_txn_counts()
-        if not df_days.empty:
-            df_days["day"] = df_days["day"].astype(str)
-            st.line_chart(df_days.set_index("day"))
-        else:
-            st.info("Not enough data for daily transaction chart.")
-    except Exception as e:
-        st.error(f"Unable to load daily transaction count chart: {e}")
+    with st.expander("⏱️ Query Plans & Latency (this dashboard process)"):
+        st.caption("Plans come from the EXPLAIN warm-up at startup; latencies cover every registered query run since.")
+        st.dataframe(get_query_stats(), use_container_width=True, hide_index=True)
@@ -1,23 +1,48 @@
 # File: ui/tabs/summary_tab.py
-# Description: Streamlit tab for displaying NLP-generated summaries of recent Bitcoin trends and wallet activity
+# Description: Streamlit tab for displaying statistics-based summaries of recent Bitcoin trends and wallet activity
 
 import streamlit as st
-import os
-from ui.utils.autorefresh import auto_refresh
+from ui.utils.autorefresh import auto_refresh, live_panel
+from analysis.langchain_summary import fetch_prices, get_top_wallets, paraphrase, WALLET_SAMPLE
+from analysis.stats_engine import compute_facts, render_summary
+
+
+def load_summary():
+    facts = compute_facts(fetch_prices(), get_top_wallets(WALLET_SAMPLE))
+    return facts, render_summary(facts)
+
+
+def draw_summary(data):
+    facts, summary = data
+    price = facts["price"]
+    if price:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("7d Change", f"{price['pct_change']:+.2f}%")
+        col2.metric("Trend", f"{price['slope_pct_per_day']:+.2f}%/day")
+        col3.metric("Volatility (ann.)", f"{price['annualized_volatility_pct']:.1f}%")
+        col4.metric("Max Drawdown", f"{price['max_drawdown_pct']:.2f}%")
+    st.text_area("Generated Summary", summary, height=200)
+
+    # Paraphrasing is optional and only runs on demand
+    if st.button("✍️ Paraphrase with LLM", key="summary-llm"):
+        with st.spinner("Asking the local LLM..."):
+            try:
+                st.session_state["summary_paraphrase"] = (summary, paraphrase(summary))
+            except Exception as e:
+                st.error(f"LLM unavailable: {e}")
+    cached = st.session_state.get("summary_paraphrase")
+    if cached and cached[0] == summary:
+        st.markdown(cached[1])
 
 
 def render():
-    st.markdown("### Langchain NLP Summary")
-    auto_refresh(
-        interval=3600,
-        run_script="analysis/langchain_summary.py",
-        label="Summary auto-refreshes every hour.",
+    st.markdown("### Market Summary")
+    enabled = auto_refresh(
+        label="Summary is recomputed only when new data arrived.",
         key="summary"
     )
-    summary_path = "latest_summary.txt"
-    if os.path.exists(summary_path):
-        with open(summary_path, "r") as f:
-            summary = f.read()
-        st.text_area("Generated Summary", summary, height=200)
-    else:
-        st.info("No summary found. Run your `langchain_summary.py` script to generate one.")
+    live_panel(
+        "summary", ("transactions", "wallets"),
+        load=load_summary, draw=draw_summary,
+        enabled=enabled
+    )
@@ -5,31 +5,63 @@ import streamlit as st
 import streamlit.components.v1 as components
 import os
 from ui.utils.helpers import get_graph_stats, get_node_stats
-from ui.utils.autorefresh import auto_refresh
+from ui.utils.autorefresh import auto_refresh, live_panel
 
 
-def render():
-    st.markdown("### Wallet-Transaction Graph")
-    auto_refresh(
-        interval=300,
-        run_script="analysis/graph_pyvis.py",
-        label="Graph auto-refreshes every 5 minutes with simulated wallet transactions.",
-        key="wallet_graph"
-    )
-    try:
-        total_edges, sent_count, received_count = get_graph_stats()
-        wallets, txns = get_node_stats()
-        st.metric("Wallet Nodes", wallets)
-        st.metric("Transaction Nodes", txns)
-        st.metric("Total Edges", total_edges)
-        st.caption(f"🕘 SENT: {sent_count} | 🕘 RECEIVED_BY: {received_count}")
-    except Exception as e:
-        st.error(f"Could not load graph stats: {e}")
+def load_graph_stats():
+    total_edges, sent_count, received_count = get_graph_stats()
+    wallets, txns = get_node_stats()
+    return wallets, txns, total_edges, sent_count, received_count
+
 
+def draw_graph_stats(stats):
+    wallets, txns, total_edges, sent_count, received_count = stats
+    st.metric("Wallet Nodes", wallets)
+    st.metric("Transaction Nodes", txns)
+    st.metric("Total Edges", total_edges)
+    st.caption(f"🕘 SENT: {sent_count} | 🕘 RECEIVED_BY: {received_count}")
+
+
+def draw_graph(_):
     graph_path = "wallet_graph.html"
     if os.path.exists(graph_path):
         with open(graph_path, "r") as f:
             html = f.read()
         components.html(html, height=800, scrolling=True)
     else:
-        st.warning("Wallet graph not found. Run `graph_pyvis.py` to generate it.")
+        st.warning("Wallet graph not found. Run `python -m analysis.graph_pyvis` to generate it.")
+
+
+def draw_highlighted_graph():
+    st.info(f"Highlighting {len(st.session_state.get('traced_paths', []))} traced fund-flow path(s).")
+    if st.button("Clear Highlight"):
+        st.session_state.pop("highlight_edges", None)
+        st.rerun()
+
+    from analysis.graph_pyvis import fetch_graph_data, create_pyvis_graph
+    graph_path = "wallet_graph_trace.html"
+    create_pyvis_graph(fetch_graph_data(), output_file=graph_path, highlight=st.session_state["highlight_edges"])
+    with open(graph_path, "r") as f:
+        components.html(f.read(), height=800, scrolling=True)
+
+
+def render():
+    st.markdown("### Wallet-Transaction Graph")
+    enabled = auto_refresh(
+        label="Graph refreshes every 5 minutes when new simulated wallet transactions arrive.",
+        key="wallet_graph"
+    )
+    live_panel(
+        "wallet_graph_stats", ("transactions", "wallets"),
+        load=load_graph_stats, draw=draw_graph_stats,
+        interval=60, enabled=enabled
+    )
+
+    if st.session_state.get("highlight_edges"):
+        draw_highlighted_graph()
+    else:
+        live_panel(
+            "wallet_graph", ("wallets",),
+            load=lambda: None, draw=draw_graph,
+            interval=300, enabled=enabled, run_script="analysis.graph_pyvis"
+        )
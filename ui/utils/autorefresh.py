@@ -1,17 +1,29 @@
 # File: ui/utils/autorefresh.py
-# Description: Utility to enable optional auto-refresh in Streamlit tabs, with optional script execution
+# Description: Fragment-scoped auto-refresh for Streamlit panels, driven by the ingest pipeline's data-version watermark
 
 import streamlit as st
-from streamlit_autorefresh import st_autorefresh
 import subprocess
+from ui.utils.helpers import driver
+from utils.data_version import get_data_versions
 
-def auto_refresh(interval=60, run_script=None, label=None, key="default"):
+# Version checks are shared by every panel and session for this long, so N open panels cost one tiny query
+VERSION_CHECK_TTL = 2
+
+# Data versions each generated artifact was last rebuilt at (process-wide, shared by all sessions)
+_artifact_versions = {}
+
+
+@st.cache_data(ttl=VERSION_CHECK_TTL, show_spinner=False)
+def current_versions(scopes):
+    with driver.session() as session:
+        return get_data_versions(session, scopes)
+
+
+def auto_refresh(label=None, key="default"):
     """
-    Auto-refreshes the Streamlit app and optionally runs a script before refresh.
+    Renders the auto-refresh toggle for a tab and returns whether it is enabled.
 
     Parameters:
-    - interval: Refresh interval in seconds (default 60)
-    - run_script: Optional script path to run before refresh
     - key: Unique key for URL parameter and toggle state
     - label: Optional label to display above the toggle
     """
@@ -27,11 +39,53 @@ def auto_refresh(interval=60, run_script=None, label=None, key="default"):
 
     # Update URL state
     st.query_params.update({f"refresh_{key}": "1" if toggle else "0"})
+    return toggle
+
+
+def live_panel(key, scopes, load, draw, interval=60, enabled=True, run_script=None):
+    """
+    Renders one panel as an independent fragment that only re-queries when its data changed.
 
-    if toggle:
-        if run_script:
+    Every `interval` seconds (while enabled) the fragment re-runs on its own, without
+    rerunning the page. It compares the data-version watermark of `scopes` with the
+    version its cached data was loaded at. Only on a change does it run `run_script`
+    (to regenerate an artifact, once per change across all sessions) and `load()`.
+    Otherwise `draw()` reuses the cached result.
+
+    Parameters:
+    - key: Unique panel key for session state
+    - scopes: Watermark scopes the panel depends on, e.g. ("transactions", "wallets")
+    - load: Zero-argument function that queries the data
+    - draw: Function that renders the loaded data
+    - interval: Fragment re-run interval in seconds
+    - enabled: Whether the panel auto-refreshes (usually the tab's auto_refresh toggle)
+    - run_script: Optional module (e.g. "analysis.price_chart") to run before load when data changed
+    """
+
+    @st.fragment(run_every=interval if enabled else None)
+    def panel():
+        cache_key = f"panel-{key}"
+        try:
+            versions = current_versions(tuple(scopes))
+        except Exception:
+            versions = None  # Neo4j unreachable: keep showing the last data we have
+
+        cached = st.session_state.get(cache_key)
+        if cached is None or (versions is not None and cached["versions"] != versions):
+            if run_script and enabled and versions is not None and _artifact_versions.get(run_script) != versions:
+                try:
+                    subprocess.run(["python", "-m", run_script], check=True)
+                    _artifact_versions[run_script] = versions
+                except subprocess.CalledProcessError as e:
+                    st.error(f"❌ Failed to run: {run_script}\n\n{e}")
             try:
-                subprocess.run(["python", run_script], check=True)
-            except subprocess.CalledProcessError as e:
-                st.error(f"❌ Failed to run: {run_script}\n\n{e}")
-        st_autorefresh(interval=interval * 1000, key=f"autorefresh-{key}")
+                data = load()
+            except Exception as e:
+                st.error(f"Unable to load {key.replace('_', ' ')}: {e}")
+                return
+            cached = {"versions": versions, "data": data}
+            st.session_state[cache_key] = cached
+
+        draw(cached["data"])
+
+    panel()
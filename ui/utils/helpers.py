@@ -7,6 +7,7 @@ from datetime import datetime
 from neo4j import GraphDatabase
 from neo4j.time import Date, DateTime, Time, Duration
 from dotenv import load_dotenv
+from utils.queries import run_query, query_stats
 
 # Load environment variables and initialize Neo4j driver
 load_dotenv()
@@ -18,77 +19,59 @@ driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
 
 def get_node_stats():
     with driver.session() as session:
-        result = session.run("""
-            RETURN
-              count { MATCH (w:Wallet) RETURN w } AS wallet_count,
-              count { MATCH (t:Transaction) RETURN t } AS txn_count
-        """)
-        record = result.single()
+        record = run_query(session, "node_stats")[0]
         return record["wallet_count"], record["txn_count"]
 
 
 def get_graph_stats():
     with driver.session() as session:
-        result = session.run("""
-            MATCH ()-[r]->() RETURN
-              count(r) AS total_edges,
-              count { MATCH ()-[x:SENT]->() RETURN x } AS sent_count,
-              count { MATCH ()-[y:RECEIVED_BY]->() RETURN y } AS received_count
-        """)
-        record = result.single()
+        record = run_query(session, "graph_stats")[0]
         return record["total_edges"], record["sent_count"], record["received_count"]
 
 
-def get_top_senders():
-    query = """
-        MATCH (w:Wallet)-[:SENT]->()
-        RETURN w.address AS wallet, COUNT(*) AS sent_count
-        ORDER BY sent_count DESC
-        LIMIT 5
-    """
+def get_top_senders(limit=5):
     with driver.session() as session:
-        result = session.run(query)
-        return pd.DataFrame([dict(r) for r in result])
+        return pd.DataFrame([dict(r) for r in run_query(session, "top_senders", limit=limit)])
 
 
-def get_top_receivers():
-    query = """
-        MATCH (w:Wallet)<-[:RECEIVED_BY]-()
-        RETURN w.address AS wallet, COUNT(*) AS received_count
-        ORDER BY received_count DESC
-        LIMIT 5
-    """
+def get_top_receivers(limit=5):
     with driver.session() as session:
-        result = session.run(query)
-        return pd.DataFrame([dict(r) for r in result])
+        return pd.DataFrame([dict(r) for r in run_query(session, "top_receivers", limit=limit)])
 
 
 def get_24h_transaction_count():
-    query = """
-        MATCH (t:Transaction)
-        WHERE datetime(t.timestamp) > datetime() - duration('P1D')
-        RETURN count(t) AS recent_txns
-    """
     with driver.session() as session:
-        record = session.run(query).single()
-        return record["recent_txns"]
+        return run_query(session, "transactions_last_24h")[0]["recent_txns"]
 
 
-def get_daily_txn_counts():
-    query = """
-        MATCH (t:Transaction)
-        WHERE datetime(t.timestamp) >= datetime() - duration('P7D')
-        RETURN date(datetime(t.timestamp)) AS day, count(*) AS txn_count
-        ORDER BY day
-    """
+def get_daily_txn_counts(days=7):
     with driver.session() as session:
-        result = session.run(query)
-        return pd.DataFrame([dict(r) for r in result])
+        return pd.DataFrame([dict(r) for r in run_query(session, "daily_txn_counts", days=days)])
 
 
-def run_custom_query(query):
+def get_wallet_centrality(limit=10):
     with driver.session() as session:
-        result = session.run(query)
+        return pd.DataFrame([dict(r) for r in run_query(session, "wallet_centrality", limit=limit)])
+
+
+def get_component_summary():
+    with driver.session() as session:
+        record = run_query(session, "component_summary")[0]
+        return record["component_count"], record["largest_component"]
+
+
+def get_recent_alerts(limit=50):
+    with driver.session() as session:
+        return pd.DataFrame([dict(r) for r in run_query(session, "recent_alerts", limit=limit)])
+
+
+def get_query_stats():
+    return pd.DataFrame(query_stats())
+
+
+def run_custom_query(query, params=None):
+    with driver.session() as session:
+        result = session.run(query, params or {})
         return [dict(r) for r in result]
 
 
@@ -0,0 +1,41 @@
+# File: ui/utils/timing.py
+# Description: Records dashboard cold-start and per-rerun timings to a JSONL file for tracking over time
+
+import json
+import time
+import datetime
+from pathlib import Path
+
+TIMINGS_FILE = Path("data/metrics/dashboard_timings.jsonl")
+
+# This module is imported once per Streamlit server process, so the first run it sees is the cold start
+_cold_start_pending = True
+
+
+def record_run(view, started_at, session_state):
+    """Log the duration of the current script run and return (kind, seconds).
+
+    kind is "cold_start" for the first run in the process, "session_start" for the
+    first run of a new browser session and "rerun" otherwise.
+    """
+    global _cold_start_pending
+    seconds = time.perf_counter() - started_at
+
+    if _cold_start_pending:
+        kind = "cold_start"
+        _cold_start_pending = False
+    elif not session_state.get("_timing_seen_session"):
+        kind = "session_start"
+    else:
+        kind = "rerun"
+    session_state["_timing_seen_session"] = True
+
+    TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(TIMINGS_FILE, "a") as f:
+        f.write(json.dumps({
+            "at": datetime.datetime.now().isoformat(),
+            "kind": kind,
+            "view": view,
+            "seconds": round(seconds, 4),
+        }) + "\n")
+    return kind, seconds
@@ -0,0 +1,29 @@
+# File: utils/atomic.py
+# Description: Atomic file replacement so readers (e.g. the dashboard) never see a half-written artifact
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path next to `path`; on success it is renamed over `path` in one step.
+
+    The temp file keeps the original suffix so writers that infer the format
+    from the name (matplotlib, pyvis) behave the same. On error it is removed.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_text_atomic(path, text):
+    with atomic_path(path) as tmp:
+        Path(tmp).write_text(text)
@@ -0,0 +1,30 @@
+# File: utils/data_version.py
+# Description: Data-version watermarks bumped by every ingest commit so readers can cheaply detect changes
+
+import datetime
+from utils.queries import run_query
+
+# Scopes used across the project:
+#   transactions - Transaction ticks and price rollups (push, stream, backfill, retention)
+#   wallets      - Wallet nodes and SENT/RECEIVED_BY edges (simulate_wallets)
+#   analytics    - PageRank/degree/component scores on Wallet nodes (graph_analytics)
+#   alerts       - Alert nodes raised by the streaming anomaly detector (push, stream)
+SCOPES = ("transactions", "wallets", "analytics", "alerts")
+
+
+def ensure_data_version_schema(session):
+    """Make the scope unique so concurrent MERGEs cannot create duplicate watermarks (merging any existing ones first)."""
+    merged = run_query(session, "dedupe_data_versions")[0]["merged"]
+    if merged:
+        print(f"🧹 Merged duplicate DataVersion nodes for {merged} scope(s)")
+    session.run("CREATE CONSTRAINT data_version_scope IF NOT EXISTS FOR (v:DataVersion) REQUIRE v.scope IS UNIQUE")
+
+
+def bump_data_version(tx, *scopes):
+    """Increment the watermark for each scope; call inside the same transaction as the write it describes."""
+    run_query(tx, "bump_data_version", scopes=list(scopes), now=datetime.datetime.now().isoformat())
+
+
+def get_data_versions(session, scopes=SCOPES):
+    """Return {scope: version} (0 for scopes that were never bumped) in a single lookup."""
+    return {r["scope"]: r["version"] for r in run_query(session, "data_versions", scopes=list(scopes))}
@@ -0,0 +1,540 @@
+# File: utils/queries.py
+# Description: Central registry of named, parameterized Cypher queries with EXPLAIN warm-up and per-query plan/latency stats
+
+import os
+import time
+import argparse
+import threading
+from collections import deque
+
+# Every query the project sends, keyed by name. Values always travel as $parameters, never
+# interpolated into the text, so each query compiles to exactly one cached plan on the server.
+# "sample" holds typed example parameters used for EXPLAIN warm-up; "label" marks Query Explorer samples.
+QUERIES = {
+    # --- dashboard (ui/utils/helpers.py) ---------------------------------------
+    "node_stats": {
+        "cypher": """
+            RETURN
+              count { MATCH (w:Wallet) RETURN w } AS wallet_count,
+              count { MATCH (t:Transaction) RETURN t } AS txn_count
+        """,
+        "sample": {},
+    },
+    "graph_stats": {
+        "cypher": """
+            MATCH ()-[r]->() RETURN
+              count(r) AS total_edges,
+              count { MATCH ()-[x:SENT]->() RETURN x } AS sent_count,
+              count { MATCH ()-[y:RECEIVED_BY]->() RETURN y } AS received_count
+        """,
+        "sample": {},
+    },
+    "top_senders": {
+        "cypher": """
+            MATCH (w:Wallet)-[:SENT]->()
+            RETURN w.address AS wallet, COUNT(*) AS sent_count
+            ORDER BY sent_count DESC
+            LIMIT $limit
+        """,
+        "sample": {"limit": 5},
+    },
+    "top_receivers": {
+        "cypher": """
+            MATCH (w:Wallet)<-[:RECEIVED_BY]-()
+            RETURN w.address AS wallet, COUNT(*) AS received_count
+            ORDER BY received_count DESC
+            LIMIT $limit
+        """,
+        "sample": {"limit": 5},
+    },
+    "transactions_last_24h": {
+        "cypher": """
+            MATCH (t:Transaction)
+            WHERE datetime(t.timestamp) > datetime() - duration('P1D')
+            RETURN count(t) AS recent_txns
+        """,
+        "sample": {},
+    },
+    "daily_txn_counts": {
+        "cypher": """
+            MATCH (t:Transaction)
+            WHERE datetime(t.timestamp) >= datetime() - duration({days: $days})
+            RETURN date(datetime(t.timestamp)) AS day, count(*) AS txn_count
+            ORDER BY day
+        """,
+        "sample": {"days": 7},
+    },
+    "wallet_centrality": {
+        "cypher": """
+            MATCH (w:Wallet)
+            WHERE w.pagerank IS NOT NULL
+            RETURN w.address AS wallet, w.pagerank AS pagerank,
+                   w.in_degree AS in_degree, w.out_degree AS out_degree,
+                   w.component AS component
+            ORDER BY pagerank DESC
+            LIMIT $limit
+        """,
+        "sample": {"limit": 10},
+    },
+    "component_summary": {
+        "cypher": """
+            MATCH (w:Wallet)
+            WHERE w.component IS NOT NULL
+            WITH w.component AS component, count(*) AS wallets
+            RETURN count(component) AS component_count, max(wallets) AS largest_component
+        """,
+        "sample": {},
+    },
+    "recent_alerts": {
+        "cypher": """
+            MATCH (a:Alert)
+            RETURN a.timestamp AS timestamp, a.metric AS metric, a.detector AS detector,
+                   a.direction AS direction, a.change_pct AS change_pct, a.score AS score, a.value AS value
+            ORDER BY a.timestamp DESC
+            LIMIT $limit
+        """,
+        "sample": {"limit": 50},
+    },
+
+    # --- data-version watermarks (utils/data_version.py) -----------------------
+    "bump_data_version": {
+        "cypher": """
+            UNWIND $scopes AS scope
+            MERGE (v:DataVersion {scope: scope})
+            SET v.version = coalesce(v.version, 0) + 1, v.updated_at = $now
+        """,
+        "sample": {"scopes": ["transactions"], "now": "2024-01-01T00:00:00"},
+    },
+    "data_versions": {
+        "cypher": """
+            UNWIND $scopes AS scope
+            OPTIONAL MATCH (v:DataVersion {scope: scope})
+            RETURN scope, coalesce(v.version, 0) AS version
+        """,
+        "sample": {"scopes": ["transactions"]},
+    },
+    "dedupe_data_versions": {
+        "cypher": """
+            MATCH (v:DataVersion)
+            WITH v.scope AS scope, collect(v) AS nodes, max(v.version) AS version
+            WHERE size(nodes) > 1
+            WITH nodes[0] AS keep, nodes[1..] AS extra, version
+            FOREACH (n IN extra | DETACH DELETE n)
+            SET keep.version = version
+            RETURN count(keep) AS merged
+        """,
+        "sample": {},
+    },
+
+    # --- price tiers and retention (utils/rollup.py) ---------------------------
+    "retention_cutoffs": {
+        "cypher": "MATCH (s:RetentionState {name: $name}) RETURN s.daily_cutoff AS daily, s.hourly_cutoff AS hourly",
+        "sample": {"name": "price_tiers"},
+    },
+    "set_retention_cutoffs": {
+        "cypher": """
+            MERGE (s:RetentionState {name: $name})
+            SET s.daily_cutoff = $daily, s.hourly_cutoff = $hourly, s.updated_at = $now
+        """,
+        "sample": {"name": "price_tiers", "daily": "", "hourly": "", "now": "2024-01-01T00:00:00"},
+    },
+    "merge_rollups": {
+        # A bucket can be filled across several batches (or by late backfills), so merge with what is already there.
+        # SET items apply left to right: weighted averages are computed before tick_count changes.
+        "cypher": """
+            UNWIND $rows AS row
+            MERGE (r:PriceRollup {tier: $tier, bucket: row.bucket})
+            ON CREATE SET r += row
+            ON MATCH SET
+                r.open = CASE WHEN row.first_ts < r.first_ts THEN row.open ELSE r.open END,
+                r.first_ts = CASE WHEN row.first_ts < r.first_ts THEN row.first_ts ELSE r.first_ts END,
+                r.close = CASE WHEN row.last_ts > r.last_ts THEN row.close ELSE r.close END,
+                r.last_ts = CASE WHEN row.last_ts > r.last_ts THEN row.last_ts ELSE r.last_ts END,
+                r.high = CASE WHEN row.high > r.high THEN row.high ELSE r.high END,
+                r.low = CASE WHEN row.low < r.low THEN row.low ELSE r.low END,
+                r.avg_price = (r.avg_price * r.tick_count + row.avg_price * row.tick_count) / (r.tick_count + row.tick_count),
+                r.volume = (r.volume * r.tick_count + row.volume * row.tick_count) / (r.tick_count + row.tick_count),
+                r.tick_count = r.tick_count + row.tick_count
+        """,
+        "sample": {"tier": "hourly", "rows": []},
+    },
+    "ticks_to_compact": {
+        "cypher": """
+            MATCH (t:Transaction)
+            WHERE t.timestamp < $cutoff AND t.price_usd IS NOT NULL AND t.rolled_up IS NULL
+            WITH t ORDER BY t.timestamp LIMIT $limit
+            RETURN elementId(t) AS id, t.timestamp AS ts, t.price_usd AS price,
+                   coalesce(t.volume_24h, 0.0) AS volume, EXISTS { (t)--(:Wallet) } AS linked
+        """,
+        "sample": {"cutoff": "2024-01-01T00:00:00", "limit": 2000},
+    },
+    "delete_ticks": {
+        "cypher": """
+            UNWIND $ids AS id
+            MATCH (t:Transaction) WHERE elementId(t) = id
+            DETACH DELETE t
+        """,
+        "sample": {"ids": []},
+    },
+    "flag_ticks_rolled_up": {
+        "cypher": """
+            UNWIND $ids AS id
+            MATCH (t:Transaction) WHERE elementId(t) = id
+            SET t.rolled_up = true
+        """,
+        "sample": {"ids": []},
+    },
+    "hourly_to_compact": {
+        "cypher": """
+            MATCH (r:PriceRollup {tier: 'hourly'})
+            WHERE r.bucket < $cutoff
+            WITH r ORDER BY r.bucket LIMIT $limit
+            RETURN elementId(r) AS id, r.first_ts AS first_ts, r.last_ts AS last_ts, r.open AS open, r.high AS high, r.low AS low,
+                   r.close AS close, r.avg_price AS avg_price, r.volume AS volume, r.tick_count AS tick_count
+        """,
+        "sample": {"cutoff": "2024-01-01T00:00:00", "limit": 2000},
+    },
+    "delete_rollups": {
+        "cypher": """
+            UNWIND $ids AS id
+            MATCH (r:PriceRollup) WHERE elementId(r) = id
+            DELETE r
+        """,
+        "sample": {"ids": []},
+    },
+    "daily_prices": {
+        "cypher": """
+            CALL {
+                MATCH (t:Transaction)
+                WHERE t.timestamp >= $raw_from AND t.price_usd IS NOT NULL AND t.rolled_up IS NULL
+                RETURN substring(t.timestamp, 0, 10) AS day, t.price_usd AS avg_p,
+                       t.price_usd AS max_p, t.price_usd AS min_p, 1 AS n
+                UNION ALL
+                MATCH (r:PriceRollup)
+                WHERE r.tier IN ['hourly', 'daily'] AND r.bucket >= $since_bucket AND r.bucket < $hourly_cutoff
+                RETURN substring(r.bucket, 0, 10) AS day, r.avg_price AS avg_p,
+                       r.high AS max_p, r.low AS min_p, r.tick_count AS n
+            }
+            WITH day, sum(avg_p * n) / sum(n) AS avg_price, max(max_p) AS max_price, min(min_p) AS min_price
+            RETURN date(day) AS day, avg_price, max_price, min_price
+            ORDER BY day
+        """,
+        "sample": {"raw_from": "2024-01-01T00:00:00", "since_bucket": "2024-01-01", "hourly_cutoff": ""},
+    },
+    "price_series": {
+        "cypher": """
+            CALL {
+                MATCH (t:Transaction)
+                WHERE t.timestamp >= $raw_from AND t.price_usd IS NOT NULL AND t.rolled_up IS NULL
+                RETURN t.timestamp AS timestamp, t.price_usd AS price, t.volume_24h AS volume
+                UNION ALL
+                MATCH (r:PriceRollup)
+                WHERE r.tier IN ['hourly', 'daily'] AND r.bucket >= $since_bucket AND r.bucket < $hourly_cutoff
+                RETURN r.bucket AS timestamp, r.close AS price, r.volume AS volume
+            }
+            RETURN timestamp, price, volume
+            ORDER BY timestamp
+        """,
+        "sample": {"raw_from": "2024-01-01T00:00:00", "since_bucket": "2024-01-01", "hourly_cutoff": ""},
+    },
+
+    # --- ingest ----------------------------------------------------------------
+    "upsert_ticks": {
+        "cypher": """
+            UNWIND $rows AS row
+            MERGE (t:Transaction {timestamp: row.timestamp})
+            SET t.price_usd = row.price_usd,
+                t.market_cap = row.market_cap,
+                t.volume_24h = row.volume_24h
+        """,
+        "sample": {"rows": []},
+    },
+    "create_alerts": {
+        "cypher": """
+            UNWIND $rows AS a
+            MATCH (t:Transaction {timestamp: a.timestamp})
+            MERGE (al:Alert {timestamp: a.timestamp, metric: a.metric, detector: a.detector})
+            SET al.value = a.value,
+                al.change_pct = a.change_pct,
+                al.score = a.score,
+                al.threshold = a.threshold,
+                al.direction = a.direction,
+                al.created_at = $now
+            MERGE (al)-[:TRIGGERED_BY]->(t)
+        """,
+        "sample": {"rows": [], "now": "2024-01-01T00:00:00"},
+    },
+    "unsimulated_ticks": {
+        "cypher": """
+            MATCH (t:Transaction)
+            WHERE t.simulated IS NULL
+            RETURN t.timestamp AS ts
+            ORDER BY ts
+        """,
+        "sample": {},
+    },
+    "link_wallets": {
+        "cypher": """
+            UNWIND $rows AS row
+            MERGE (s:Wallet {address: row.sender})
+            MERGE (t:Transaction {tx_id: row.tx_id})
+            SET t.timestamp = row.timestamp, t.simulated = true
+            MERGE (s)-[:SENT]->(t)
+            WITH t, row
+            UNWIND row.receivers AS receiver
+            MERGE (r:Wallet {address: receiver})
+            MERGE (t)-[:RECEIVED_BY]->(r)
+        """,
+        "sample": {"rows": []},
+    },
+    "drill_probe": {
+        "cypher": """
+            UNWIND $rows AS row
+            MERGE (p:DrillProbe {seq: row.seq})
+            SET p.at = row.at
+        """,
+        "sample": {"rows": []},
+    },
+    "delete_drill_probes": {
+        "cypher": """
+            MATCH (p:DrillProbe)
+            DETACH DELETE p
+        """,
+        "sample": {},
+    },
+
+    # --- analysis --------------------------------------------------------------
+    "top_receiving_wallets": {
+        "cypher": """
+            MATCH (w:Wallet)<-[:RECEIVED_BY]-(:Transaction)
+            RETURN w.address AS address, count(*) AS received_count
+            ORDER BY received_count DESC
+            LIMIT $n
+        """,
+        "sample": {"n": 3},
+    },
+    "price_alerts": {
+        "cypher": """
+            MATCH (a:Alert)
+            WHERE a.timestamp >= $since AND a.metric = 'price_usd'
+            RETURN a.timestamp AS timestamp, a.value AS price, a.direction AS direction
+        """,
+        "sample": {"since": "2024-01-01T00:00:00"},
+    },
+    "recent_graph_edges": {
+        "cypher": """
+            CALL {
+                MATCH (w:Wallet)-[:SENT]->(t:Transaction)
+                RETURN w.address AS from, t.tx_id AS to, t.timestamp AS ts
+                UNION
+                MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet)
+                RETURN t.tx_id AS from, w.address AS to, t.timestamp AS ts
+            }
+            RETURN from, to
+            ORDER BY ts DESC
+            LIMIT $limit
+        """,
+        "sample": {"limit": 200},
+    },
+    "wallet_graph_counts": {
+        "cypher": """
+            RETURN
+              count { MATCH (:Wallet)-[x:SENT]->(:Transaction) RETURN x } AS sent_count,
+              count { MATCH (:Transaction)-[y:RECEIVED_BY]->(:Wallet) RETURN y } AS received_count,
+              count { MATCH (w:Wallet) RETURN w } AS wallet_count
+        """,
+        "sample": {},
+    },
+    "wallet_transfers": {
+        "cypher": """
+            MATCH (s:Wallet)-[:SENT]->(t:Transaction)-[:RECEIVED_BY]->(r:Wallet)
+            RETURN s.address AS sender, r.address AS receiver, t.tx_id AS tx_id, t.timestamp AS ts
+        """,
+        "sample": {},
+    },
+    "write_wallet_scores": {
+        "cypher": """
+            UNWIND $rows AS row
+            MATCH (w:Wallet {address: row.address})
+            SET w.pagerank = row.pagerank,
+                w.in_degree = row.in_degree,
+                w.out_degree = row.out_degree,
+                w.component = row.component,
+                w.component_size = row.component_size,
+                w.analytics_version = $version
+        """,
+        "sample": {"rows": [], "version": "w0"},
+    },
+    "clear_stale_wallet_scores": {
+        "cypher": """
+            MATCH (w:Wallet)
+            WHERE w.analytics_version IS NOT NULL AND w.analytics_version <> $version
+            REMOVE w.pagerank, w.in_degree, w.out_degree, w.component, w.component_size, w.analytics_version
+            RETURN count(w) AS cleared
+        """,
+        "sample": {"version": "w0"},
+    },
+
+    # --- Query Explorer samples ------------------------------------------------
+    "sample_wallets": {
+        "label": "Show Wallets",
+        "cypher": "MATCH (w:Wallet) RETURN w LIMIT $limit",
+        "sample": {"limit": 5},
+    },
+    "sample_transactions": {
+        "label": "Show Transactions",
+        "cypher": "MATCH (t:Transaction) RETURN t.tx_id, t.timestamp, t.price_usd LIMIT $limit",
+        "sample": {"limit": 5},
+    },
+    "sample_wallet_transfers": {
+        "label": "Transactions by wallet",
+        "cypher": "MATCH (w:Wallet {address: $wallet})-[:SENT]->(t:Transaction)-[:RECEIVED_BY]->(r:Wallet) RETURN r.address AS receiver, t.tx_id AS tx_id",
+        "sample": {"wallet": "wallet_017"},
+    },
+    "sample_top_receivers": {
+        "label": "Top Receivers",
+        "cypher": "MATCH (w:Wallet)<-[:RECEIVED_BY]-() RETURN w.address AS wallet, count(*) AS received ORDER BY received DESC LIMIT $limit",
+        "sample": {"limit": 5},
+    },
+    "sample_recent_transactions": {
+        "label": "Recent Transactions",
+        "cypher": "MATCH (t:Transaction) WHERE datetime(t.timestamp) > datetime() - duration({hours: $hours}) RETURN t.tx_id, t.timestamp, t.price_usd",
+        "sample": {"hours": 24},
+    },
+    "sample_daily_volume": {
+        "label": "Transaction Volume Per Day",
+        "cypher": "MATCH (t:Transaction) WHERE datetime(t.timestamp) >= datetime() - duration({days: $days}) RETURN date(datetime(t.timestamp)) AS day, count(*) AS txn_count ORDER BY day",
+        "sample": {"days": 7},
+    },
+    "sample_received_by_wallet": {
+        "label": "Received by wallet recently",
+        "cypher": "MATCH (t:Transaction)-[:RECEIVED_BY]->(w:Wallet {address: $wallet}) WHERE datetime(t.timestamp) > datetime() - duration({hours: $hours}) RETURN t.tx_id, t.timestamp",
+        "sample": {"wallet": "wallet_017", "hours": 24},
+    },
+}
+
+# Latency samples kept per query for percentiles
+LATENCY_WINDOW = 500
+
+_lock = threading.Lock()
+_latency = {}  # name -> {"calls", "rows", "total_ms", "max_ms", "recent": deque}
+_plans = {}    # name -> {"plan_ms", "operators", "error"}
+
+
+def cypher(name):
+    return QUERIES[name]["cypher"]
+
+
+def explorer_samples():
+    """{label: (cypher, sample params)} for the Query Explorer."""
+    return {q["label"]: (q["cypher"].strip(), dict(q["sample"])) for q in QUERIES.values() if "label" in q}
+
+
+def _record(name, started, rows):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _lock:
+        s = _latency.setdefault(name, {"calls": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                       "recent": deque(maxlen=LATENCY_WINDOW)})
+        s["calls"] += 1
+        s["rows"] += rows
+        s["total_ms"] += elapsed_ms
+        s["max_ms"] = max(s["max_ms"], elapsed_ms)
+        s["recent"].append(elapsed_ms)
+
+
+def run_query(runner, name, **params):
+    """Run a registered query on a session or transaction and return all records; latency is recorded."""
+    started = time.perf_counter()
+    records = list(runner.run(QUERIES[name]["cypher"], params))
+    _record(name, started, len(records))
+    return records
+
+
+def stream_query(runner, name, **params):
+    """Like run_query, but yields records as they arrive (for large exports); latency covers the full stream."""
+    started = time.perf_counter()
+    rows = 0
+    for record in runner.run(QUERIES[name]["cypher"], params):
+        rows += 1
+        yield record
+    _record(name, started, rows)
+
+
+def flatten_plan(plan):
+    """Operator names of an EXPLAIN plan, depth-first, e.g. ['ProduceResults', 'Projection', 'NodeIndexSeek']."""
+    if not plan:
+        return []
+    operators = [plan.get("operatorType", "?").split("@")[0]]
+    for child in plan.get("children", []):
+        operators += flatten_plan(child)
+    return operators
+
+
+def explain(session, name):
+    """Compile (but do not run) a registered query so its plan is cached; return its plan stats."""
+    query = QUERIES[name]
+    started = time.perf_counter()
+    try:
+        summary = session.run("EXPLAIN " + query["cypher"], query["sample"]).consume()
+        info = {"plan_ms": (time.perf_counter() - started) * 1000, "operators": flatten_plan(summary.plan), "error": None}
+    except Exception as e:
+        info = {"plan_ms": (time.perf_counter() - started) * 1000, "operators": [], "error": str(e)}
+    with _lock:
+        _plans[name] = info
+    return info
+
+
+def warm_up(driver, names=None):
+    """EXPLAIN every registered query once so the first real call skips planning. Returns {name: plan stats}."""
+    try:
+        driver.verify_connectivity()
+    except Exception as e:
+        print(f"⚠️ Skipping query warm-up, Neo4j unreachable: {e}")
+        return {}
+    with driver.session() as session:
+        return {name: explain(session, name) for name in (names or QUERIES)}
+
+
+def query_stats():
+    """One row per registered query with plan and latency statistics (this process only)."""
+    rows = []
+    with _lock:
+        for name in QUERIES:
+            s = _latency.get(name)
+            p = _plans.get(name, {})
+            recent = sorted(s["recent"]) if s else []
+
+            def pct(q):
+                return round(recent[min(len(recent) - 1, int(q * len(recent)))], 2) if recent else None
+
+            rows.append({
+                "query": name,
+                "calls": s["calls"] if s else 0,
+                "rows": s["rows"] if s else 0,
+                "mean_ms": round(s["total_ms"] / s["calls"], 2) if s else None,
+                "p50_ms": pct(0.50),
+                "p95_ms": pct(0.95),
+                "max_ms": round(s["max_ms"], 2) if s else None,
+                "plan_ms": round(p["plan_ms"], 2) if p else None,
+                "plan": " ← ".join(p.get("operators", [])) or p.get("error"),
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    from neo4j import GraphDatabase
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="EXPLAIN every registered query and print its plan")
+    parser.add_argument("names", nargs="*", help="Only these queries (default: all)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    driver = GraphDatabase.driver(os.getenv("NEO4J_URI"), auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")))
+    print(f"🔥 Warming up {len(args.names or QUERIES)} queries...")
+    for name, info in warm_up(driver, args.names).items():
+        if info["error"]:
+            print(f"❌ {name}: {info['error']}")
+        else:
+            print(f"✅ {name:<28} {info['plan_ms']:7.1f} ms  {' ← '.join(info['operators'])}")
+    driver.close()
@@ -0,0 +1,170 @@
+# File: utils/rollup.py
+# Description: Compacts old Transaction ticks into hourly, then daily, OHLC+volume rollup nodes and serves tier-aware price reads
+
+import os
+import datetime
+import argparse
+from dotenv import load_dotenv
+from neo4j import GraphDatabase
+from utils.data_version import bump_data_version, ensure_data_version_schema
+from utils.queries import run_query
+
+# Load environment variables
+load_dotenv()
+URI = os.getenv("NEO4J_URI")
+USER = os.getenv("NEO4J_USER")
+PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+RAW_RETENTION_HOURS = 48   # ticks older than this are compacted into hourly rollups
+HOURLY_RETENTION_DAYS = 30  # hourly rollups older than this are compacted into daily rollups
+BATCH_SIZE = 2000           # nodes compacted + deleted per transaction
+
+# Tier boundaries are ISO strings, compared directly against t.timestamp / r.bucket so the indexes are used:
+#   daily rollups:  bucket < daily_cutoff
+#   hourly rollups: daily_cutoff <= bucket < hourly_cutoff
+#   raw ticks:      timestamp >= hourly_cutoff
+STATE_NAME = "price_tiers"
+
+driver = GraphDatabase.driver(URI, auth=(USER, PASSWORD))
+
+
+def ensure_schema(session):
+    session.run("CREATE INDEX transaction_timestamp IF NOT EXISTS FOR (t:Transaction) ON (t.timestamp)")
+    session.run("CREATE INDEX price_rollup_bucket IF NOT EXISTS FOR (r:PriceRollup) ON (r.tier, r.bucket)")
+    ensure_data_version_schema(session)
+
+
+def get_cutoffs(session):
+    """Return (daily_cutoff, hourly_cutoff); empty strings until the job has run once."""
+    records = run_query(session, "retention_cutoffs", name=STATE_NAME)
+    if not records:
+        return "", ""
+    return records[0]["daily"] or "", records[0]["hourly"] or ""
+
+
+def set_cutoffs(tx, daily_cutoff, hourly_cutoff):
+    run_query(tx, "set_retention_cutoffs", name=STATE_NAME, daily=daily_cutoff, hourly=hourly_cutoff,
+              now=datetime.datetime.now().isoformat())
+
+
+def aggregate(rows, bucket_of):
+    """Fold time-ordered rows (first_ts, last_ts, open, high, low, close, avg, volume, count) into per-bucket OHLC."""
+    buckets = {}
+    for first_ts, last_ts, o, h, l, c, avg, volume, count in rows:
+        key = bucket_of(first_ts)
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = {"bucket": key, "first_ts": first_ts, "last_ts": last_ts, "open": o, "high": h, "low": l,
+                            "close": c, "avg_price": avg, "volume": volume, "tick_count": count}
+            continue
+        total = b["tick_count"] + count
+        b["avg_price"] = (b["avg_price"] * b["tick_count"] + avg * count) / total
+        b["volume"] = (b["volume"] * b["tick_count"] + volume * count) / total
+        b["tick_count"] = total
+        b["high"] = max(b["high"], h)
+        b["low"] = min(b["low"], l)
+        b["close"] = c
+        b["last_ts"] = last_ts
+    return list(buckets.values())
+
+
+def merge_rollups(tx, tier, rows):
+    run_query(tx, "merge_rollups", tier=tier, rows=rows)
+
+
+def compact_ticks_batch(tx, cutoff, batch_size):
+    """Roll up to batch_size raw ticks older than cutoff into hourly buckets and remove them, atomically."""
+    ticks = run_query(tx, "ticks_to_compact", cutoff=cutoff, limit=batch_size)
+    if not ticks:
+        return 0
+
+    rows = [(r["ts"], r["ts"], r["price"], r["price"], r["price"], r["price"], r["price"], r["volume"], 1) for r in ticks]
+    merge_rollups(tx, "hourly", aggregate(rows, lambda ts: ts[:13] + ":00:00"))
+
+    # Ticks with wallet links are kept (and flagged as already rolled up) so SENT/RECEIVED_BY edges stay intact.
+    # Alert nodes carry their own timestamp and values, so they outlive the tick that triggered them.
+    run_query(tx, "delete_ticks", ids=[r["id"] for r in ticks if not r["linked"]])
+    run_query(tx, "flag_ticks_rolled_up", ids=[r["id"] for r in ticks if r["linked"]])
+    bump_data_version(tx, "transactions")
+    return len(ticks)
+
+
+def compact_hourly_batch(tx, cutoff, batch_size):
+    """Roll up to batch_size hourly rollups older than cutoff into daily buckets and remove them, atomically."""
+    hours = run_query(tx, "hourly_to_compact", cutoff=cutoff, limit=batch_size)
+    if not hours:
+        return 0
+
+    rows = [(r["first_ts"], r["last_ts"], r["open"], r["high"], r["low"], r["close"], r["avg_price"], r["volume"], r["tick_count"])
+            for r in hours]
+    merge_rollups(tx, "daily", aggregate(rows, lambda ts: ts[:10] + "T00:00:00"))
+
+    run_query(tx, "delete_rollups", ids=[r["id"] for r in hours])
+    bump_data_version(tx, "transactions")
+    return len(hours)
+
+
+def run_retention(raw_hours=RAW_RETENTION_HOURS, hourly_days=HOURLY_RETENTION_DAYS, batch_size=BATCH_SIZE):
+    now = datetime.datetime.now()
+    hourly_cutoff = (now - datetime.timedelta(hours=raw_hours)).replace(minute=0, second=0, microsecond=0).isoformat()
+    daily_cutoff = (now - datetime.timedelta(days=hourly_days)).replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+    with driver.session() as session:
+        ensure_schema(session)
+        previous_daily, previous_hourly = get_cutoffs(session)
+        hourly_cutoff = max(hourly_cutoff, previous_hourly)
+        daily_cutoff = min(max(daily_cutoff, previous_daily), hourly_cutoff)
+
+        ticks = 0
+        while True:
+            done = session.execute_write(compact_ticks_batch, hourly_cutoff, batch_size)
+            if not done:
+                break
+            ticks += done
+            print(f"🗜️ Compacted {ticks} tick(s) into hourly rollups...")
+
+        # Hourly tier is complete below hourly_cutoff before the daily tier advances
+        session.execute_write(set_cutoffs, previous_daily, hourly_cutoff)
+
+        hours = 0
+        while True:
+            done = session.execute_write(compact_hourly_batch, daily_cutoff, batch_size)
+            if not done:
+                break
+            hours += done
+            print(f"🗜️ Compacted {hours} hourly rollup(s) into daily rollups...")
+
+        session.execute_write(set_cutoffs, daily_cutoff, hourly_cutoff)
+
+    print(f"✅ Retention complete: {ticks} tick(s) → hourly, {hours} hourly → daily "
+          f"(raw ≥ {hourly_cutoff}, daily < {daily_cutoff})")
+
+
+# --- tier-aware reads -------------------------------------------------------
+
+def fetch_daily_prices(session, days=7):
+    """Daily avg/max/min price over the last `days` days, reading raw ticks and rollups as appropriate."""
+    since = (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat()
+    _, hourly_cutoff = get_cutoffs(session)
+    return run_query(session, "daily_prices", raw_from=max(since, hourly_cutoff), since_bucket=since[:10],
+                     hourly_cutoff=hourly_cutoff)
+
+
+def fetch_price_series(session, days=7):
+    """(timestamp, price, volume) points over the last `days` days; rollups contribute their close per bucket."""
+    since = (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat()
+    _, hourly_cutoff = get_cutoffs(session)
+    result = run_query(session, "price_series", raw_from=max(since, hourly_cutoff), since_bucket=since[:10],
+                       hourly_cutoff=hourly_cutoff)
+    return [dict(r) for r in result]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact old ticks into hourly/daily OHLC rollups")
+    parser.add_argument("--raw-hours", type=int, default=RAW_RETENTION_HOURS)
+    parser.add_argument("--hourly-days", type=int, default=HOURLY_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    run_retention(args.raw_hours, args.hourly_days, args.batch_size)
+    driver.close()